@@ -200,15 +200,24 @@ class EventLogger(object):
     def __init__(self):
         self.event_dir = None
         self.periodic_events = {}
+        # The event dir that was last created (and its permissions enforced) by save_event
+        self._created_event_dir = None
 
     def save_event(self, data):
         if self.event_dir is None:
             logger.warn("Cannot save event -- Event reporter is not initialized.")
             return
 
-        fileutil.mkdir(self.event_dir, mode=0o700)
-
-        existing_events = os.listdir(self.event_dir)
+        # Events are often saved in bursts; the event dir (and its 0o700 mode) is set up the
+        # first time it is used, and afterwards only if listing it fails, rather than for each event
+        if self._created_event_dir != self.event_dir:
+            fileutil.mkdir(self.event_dir, mode=0o700)
+            self._created_event_dir = self.event_dir
+        try:
+            existing_events = os.listdir(self.event_dir)
+        except OSError:
+            fileutil.mkdir(self.event_dir, mode=0o700)
+            existing_events = os.listdir(self.event_dir)
         if len(existing_events) >= 1000:
             existing_events.sort()
             oldest_files = existing_events[:-999]
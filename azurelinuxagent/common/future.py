@@ -2,6 +2,8 @@ import platform
 import sys
 import os
 import re
+import stat
+import time
 
 # Note broken dependency handling to avoid potential backward
 # compatibility issues on different distributions
@@ -36,6 +38,51 @@ else:
     raise ImportError("Unknown python version: {0}".format(sys.version_info))
 
 
+class _DirEntry(object):
+    """Minimal stand-in for os.DirEntry on Pythons without os.scandir (< 3.5)"""
+    def __init__(self, dir_path, name):
+        self.name = name
+        self.path = os.path.join(dir_path, name)
+        self._stat = None
+        self._lstat = None
+
+    def stat(self, follow_symlinks=True):
+        if follow_symlinks:
+            if self._stat is None:
+                self._stat = os.stat(self.path)
+            return self._stat
+        if self._lstat is None:
+            self._lstat = os.lstat(self.path)
+        return self._lstat
+
+    def _test_mode(self, test, follow_symlinks):
+        try:
+            return test(self.stat(follow_symlinks=follow_symlinks).st_mode)
+        except OSError:
+            return False
+
+    def is_dir(self, follow_symlinks=True):
+        return self._test_mode(stat.S_ISDIR, follow_symlinks)
+
+    def is_file(self, follow_symlinks=True):
+        return self._test_mode(stat.S_ISREG, follow_symlinks)
+
+    def is_symlink(self):
+        return self._test_mode(stat.S_ISLNK, False)
+
+
+def _scandir(path):
+    for name in os.listdir(path):
+        yield _DirEntry(path, name)
+
+
+"""os.scandir is only available on Python 3.5+; fall back to listdir+stat"""
+scandir = getattr(os, "scandir", _scandir)
+
+"""time.monotonic is only available on Python 3.3+; fall back to the wall clock"""
+monotonic = getattr(time, "monotonic", time.time)
+
+
 def get_linux_distribution(get_full_name, supported_dists):
     """Abstract platform.linux_distribution() call which is deprecated as of
        Python 3.5 and removed in Python 3.7"""
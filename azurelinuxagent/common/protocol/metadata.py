@@ -309,6 +309,7 @@ class MetadataProtocol(Protocol):
                 pass
 
         self._put_data(self.vm_status_uri, data)
+        return True
 
     def report_ext_status(self, ext_handler_name, ext_name, ext_status):
         validate_param('extensionStatus', ext_status, ExtensionStatus)
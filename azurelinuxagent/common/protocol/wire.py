@@ -191,7 +191,7 @@ class WireProtocol(Protocol):
     def report_vm_status(self, vm_status):
         validate_param("vm_status", vm_status, VMStatus)
         self.client.status_blob.set_vm_status(vm_status)
-        self.client.upload_status_blob()
+        return self.client.upload_status_blob()
 
     def report_ext_status(self, ext_handler_name, ext_name, ext_status):
         validate_param("ext_status", ext_status, ExtensionStatus)
@@ -1049,6 +1049,10 @@ class WireClient(object):
         return ret
 
     def upload_status_blob(self):
+        """
+        Returns True if the status blob was uploaded, or False if the upload was deferred
+        until the next goal state (ResourceGoneError); other failures raise ProtocolError
+        """
         self.update_goal_state()
         ext_conf = self.get_ext_conf()
 
@@ -1081,11 +1085,11 @@ class WireClient(object):
         try:
             host = self.get_host_plugin()
             host.put_vm_status(self.status_blob, ext_conf.status_upload_blob, ext_conf.status_upload_blob_type)
-            return
+            return True
         except ResourceGoneError:
             # do not attempt direct, force goal state update and wait to try again
             self.update_goal_state(forced=True)
-            return
+            return False
         except Exception as e:
             # for all other errors, fall back to direct
             msg = "Falling back to direct upload: {0}".format(ustr(e))
@@ -1093,7 +1097,7 @@ class WireClient(object):
 
         try:
             if self.status_blob.upload(ext_conf.status_upload_blob):
-                return
+                return True
         except Exception as e:
             msg = "Exception uploading status blob: {0}".format(ustr(e))
             self.report_status_event(msg, is_success=False)
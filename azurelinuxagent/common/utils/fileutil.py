@@ -31,7 +31,7 @@ import shutil
 import azurelinuxagent.common.logger as logger
 import azurelinuxagent.common.utils.textutil as textutil
 
-from azurelinuxagent.common.future import ustr
+from azurelinuxagent.common.future import ustr, scandir
 
 KNOWN_IOERRORS = [
     errno.EIO,          # I/O error
@@ -180,6 +180,24 @@ def chmod_tree(path, mode):
             os.chmod(os.path.join(root, file_name), mode)
 
 
+def add_mode_to_tree(path, mode):
+    """
+    Add the given mode bits to all files under the given path; files that
+    already have all of them are not changed. Like os.walk, symbolic links
+    to directories are not followed.
+    """
+    dirs = [path]
+    while dirs:
+        for entry in scandir(dirs.pop()):
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    dirs.append(entry.path)
+                continue
+            file_mode = entry.stat().st_mode
+            if file_mode & mode != mode:
+                os.chmod(entry.path, file_mode | mode)
+
+
 def findstr_in_file(file_path, line_str):
     """
     Return True if the line is in the file; False otherwise.
@@ -36,10 +36,15 @@ class FlexibleVersion(version.Version):
 
         self.prerelease = None
         self.version = ()
+        self._cmp_version = None
         if vstring:
             self._parse(str(vstring))
         return
 
+    # The compiled patterns for each (separator, pre-release tags); versions are created
+    # often (e.g. on every comparison of handler versions) and almost always use the defaults
+    _patterns = {}
+
     _nn_version = 'version'
     _nn_prerel_sep = 'prerel_sep'
     _nn_prerel_tag = 'tag'
@@ -170,11 +175,21 @@ class FlexibleVersion(version.Version):
         return s
 
     def _compile_pattern(self):
-        sep, self.sep_re = self._compile_separator(self.sep)
+        key = (self.sep, self.prerel_tags)
+        patterns = FlexibleVersion._patterns.get(key)
+        if patterns is None:
+            patterns = self._compile_patterns()
+            FlexibleVersion._patterns[key] = patterns
+        self.sep_re, self.version_re, self.prerel_tags_set = patterns
+        return
 
+    def _compile_patterns(self):
+        sep, sep_re = self._compile_separator(self.sep)
+
+        prerel_tags_set = {}
         if self.prerel_tags:
             tags = '|'.join(re.escape(tag) for tag in self.prerel_tags)
-            self.prerel_tags_set = dict(zip(self.prerel_tags, range(len(self.prerel_tags))))
+            prerel_tags_set = dict(zip(self.prerel_tags, range(len(self.prerel_tags))))
             release_re = '(?:{prerel_sep}(?P<{tn}>{tags})(?P<{nn}>\d*))?'.format(
                         prerel_sep=self._re_prerel_sep,
                         tags=tags,
@@ -187,8 +202,7 @@ class FlexibleVersion(version.Version):
             vn=self._nn_version,
             sep=sep,
             rel=release_re)
-        self.version_re = re.compile(version_re)
-        return
+        return sep_re, re.compile(version_re), prerel_tags_set
 
     def _compile_separator(self, sep):
         if sep is None:
@@ -197,15 +211,19 @@ class FlexibleVersion(version.Version):
 
     def _ensure_compatible(self, that):
         """
-        Ensures the instances have the same structure and, if so, returns length compatible
-        version lists (so that x.y.0.0 is equivalent to x.y).
+        Ensures the instances have the same structure and, if so, returns comparable
+        version tuples (without trailing zeros, so that x.y.0.0 is equivalent to x.y).
         """
         if self.prerel_tags != that.prerel_tags or self.sep != that.sep:
             raise ValueError("Unable to compare: versions have different structures")
 
-        this_version = list(self.version[:])
-        that_version = list(that.version[:])
-        while len(this_version) < len(that_version): this_version.append(0)
-        while len(that_version) < len(this_version): that_version.append(0)
+        return self._get_cmp_version(), that._get_cmp_version()
 
-        return this_version, that_version
+    def _get_cmp_version(self):
+        # Computed once per version; comparisons are far more frequent than parsing
+        if self._cmp_version is None or self._cmp_version[0] is not self.version:
+            cmp_version = list(self.version)
+            while len(cmp_version) > 0 and cmp_version[-1] == 0:
+                cmp_version.pop()
+            self._cmp_version = (self.version, tuple(cmp_version))
+        return self._cmp_version[1]
@@ -18,7 +18,7 @@
 #
 
 import datetime
-import glob
+import errno
 import json
 import operator
 import os
@@ -35,13 +35,14 @@ import zipfile
 import azurelinuxagent.common.conf as conf
 import azurelinuxagent.common.logger as logger
 import azurelinuxagent.common.utils.fileutil as fileutil
+import azurelinuxagent.common.utils.textutil as textutil
 import azurelinuxagent.common.version as version
 from azurelinuxagent.common.cgroupconfigurator import CGroupConfigurator
 from azurelinuxagent.common.errorstate import ErrorState, ERROR_STATE_DELTA_INSTALL
-from azurelinuxagent.common.event import add_event, WALAEventOperation, elapsed_milliseconds, report_event
+from azurelinuxagent.common.event import add_event, WALAEventOperation, report_event
 from azurelinuxagent.common.exception import ExtensionError, ProtocolError, ProtocolNotFoundError, \
     ExtensionDownloadError, ExtensionOperationError, ExtensionErrorCodes, ExtensionUpdateError
-from azurelinuxagent.common.future import ustr
+from azurelinuxagent.common.future import ustr, scandir, monotonic
 from azurelinuxagent.common.protocol import get_protocol_util
 from azurelinuxagent.common.protocol.restapi import ExtHandlerStatus, \
     ExtensionStatus, \
@@ -58,10 +59,10 @@ HANDLER_ENVIRONMENT_VERSION = 1.0
 
 EXTENSION_STATUS_ERROR = 'error'
 EXTENSION_STATUS_SUCCESS = 'success'
-VALID_EXTENSION_STATUS = ['transitioning', 'error', 'success', 'warning']
-EXTENSION_TERMINAL_STATUSES = ['error', 'success']
+VALID_EXTENSION_STATUS = frozenset(['transitioning', 'error', 'success', 'warning'])
+EXTENSION_TERMINAL_STATUSES = frozenset(['error', 'success'])
 
-VALID_HANDLER_STATUS = ['Ready', 'NotReady', "Installing", "Unresponsive"]
+VALID_HANDLER_STATUS = frozenset(['Ready', 'NotReady', "Installing", "Unresponsive"])
 
 HANDLER_PATTERN = "^([^-]+)-(\d+(?:\.\d+)*)"
 HANDLER_NAME_PATTERN = re.compile(HANDLER_PATTERN + "$", re.IGNORECASE)
@@ -70,21 +71,97 @@ HANDLER_PKG_PATTERN = re.compile(HANDLER_PATTERN + r"\.zip$", re.IGNORECASE)
 
 DEFAULT_EXT_TIMEOUT_MINUTES = 90
 
+# Bounds (in seconds) of the backoff used while polling for extension status
+STATUS_POLL_MIN_INTERVAL = 0.25
+STATUS_POLL_MAX_INTERVAL = 5
+
+# The VM agent status is re-sent at least this often (in seconds) even when it has not changed
+MIN_STATUS_REPORT_INTERVAL = 60
+
 AGENT_STATUS_FILE = "waagent_status.json"
+AGENT_STATUS_DROP_KEYS = frozenset(('code', 'message', 'extensions'))
 
 NUMBER_OF_DOWNLOAD_RETRIES = 5
 
+# Maximum number of stack frames included in the telemetry for extension processing errors
+TRACEBACK_LIMIT = 10
+
 DISABLE_FAILED = "AZURE_GUEST_AGENT_DISABLE_FAILED"
 UNINSTALL_FAILED = "AZURE_GUEST_AGENT_UNINSTALL_FAILED"
 EXTENSION_PATH = "AZURE_GUEST_AGENT_EXTENSION_PATH"
 EXTENSION_VERSION = "AZURE_GUEST_AGENT_EXTENSION_VERSION"
 
-def get_traceback(e):
-    if sys.version_info[0] == 3:
-        return e.__traceback__
-    elif sys.version_info[0] == 2:
-        ex_type, ex, tb = sys.exc_info()
-        return tb
+# orjson and ujson are optional dependencies; when either is installed it is used to
+# serialize the agent status and to read and write the files the agent polls on every
+# goal state iteration (extension status, handler status, manifest and heartbeat).
+# Output is compact JSON in all cases. Files consumed by the extensions themselves
+# (settings, HandlerEnvironment.json) keep using the json module.
+try:
+    import orjson
+
+    def _fast_json_dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+
+    _fast_json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        _fast_json_dumps = ujson.dumps
+        _fast_json_loads = ujson.loads
+    except ImportError:
+        _fast_json_dumps = None
+        _fast_json_loads = None
+
+
+def _json_dumps(obj):
+    if _fast_json_dumps is not None:
+        try:
+            return _fast_json_dumps(obj)
+        except (ValueError, TypeError, OverflowError):
+            pass
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def _json_loads(data):
+    # The fast codecs reject some input the json module accepts (e.g. NaN, Infinity or
+    # integers over 64 bits); those are parsed by the json module, so that the files
+    # written by the extensions are read the same way whichever codec is installed
+    if _fast_json_loads is not None:
+        try:
+            return _fast_json_loads(data)
+        except (ValueError, TypeError, OverflowError):
+            pass
+    return json.loads(data)
+
+
+def _format_traceback():
+    """
+    Format the exception being handled, keeping only the innermost TRACEBACK_LIMIT frames, which
+    include the frame that raised it
+    """
+    ex_type, ex, tb = sys.exc_info()
+    frames = traceback.format_list(traceback.extract_tb(tb)[-TRACEBACK_LIMIT:])
+    return ''.join(frames + traceback.format_exception_only(ex_type, ex))
+
+
+def _file_signature(path):
+    """
+    Return the (inode, size, mtime) of the given file, or None if it cannot be stat'ed; used to
+    detect if a file has changed since it was last read
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime
+
+
+def _elapsed_milliseconds(start):
+    """
+    Return the milliseconds elapsed since start, a value of the monotonic() clock
+    """
+    return max(0, int((monotonic() - start) * 1000))
 
 
 def validate_has_key(obj, key, fullname):
@@ -92,8 +169,17 @@ def validate_has_key(obj, key, fullname):
         raise ExtensionError("Missing: {0}".format(fullname))
 
 
+def is_in_range(val, valid_range):
+    # The valid ranges are sets, so values read from a malformed status file
+    # (e.g. a list or an object) cannot be looked up
+    try:
+        return val in valid_range
+    except TypeError:
+        return False
+
+
 def validate_in_range(val, valid_range, name):
-    if val not in valid_range:
+    if not is_in_range(val, valid_range):
         raise ExtensionError("Invalid {0}: {1}".format(name, val))
 
 
@@ -106,31 +192,39 @@ def parse_formatted_message(formatted_message):
 
 
 def parse_ext_substatus(substatus):
-    # Check extension sub status format
-    validate_has_key(substatus, 'status', 'substatus/status')
-    validate_in_range(substatus['status'], VALID_EXTENSION_STATUS,
-                      'substatus/status')
+    # Check extension sub status format; each field is looked up only once since
+    # extensions can report a large number of substatuses
+    try:
+        substatus_status = substatus.get('status')
+    except (AttributeError, TypeError):
+        raise ExtensionError("Missing: substatus/status")
+    if substatus_status is None:
+        raise ExtensionError("Missing: substatus/status")
+    validate_in_range(substatus_status, VALID_EXTENSION_STATUS, 'substatus/status')
     status = ExtensionSubStatus()
     status.name = substatus.get('name')
-    status.status = substatus.get('status')
+    status.status = substatus_status
     status.code = substatus.get('code', 0)
-    formatted_message = substatus.get('formattedMessage')
-    status.message = parse_formatted_message(formatted_message)
+    status.message = parse_formatted_message(substatus.get('formattedMessage'))
     return status
 
 
 def parse_ext_status(ext_status, data):
-    if data is None or len(data) is None:
+    if not data:
         return
     # Currently, only the first status will be reported
     data = data[0]
     # Check extension status format
-    validate_has_key(data, 'status', 'status')
-    status_data = data['status']
-    validate_has_key(status_data, 'status', 'status/status')
+    try:
+        status_data = data['status']
+    except (KeyError, TypeError):
+        raise ExtensionError("Missing: status")
+    try:
+        status = status_data['status']
+    except (KeyError, TypeError):
+        raise ExtensionError("Missing: status/status")
 
-    status = status_data['status']
-    if status not in VALID_EXTENSION_STATUS:
+    if not is_in_range(status, VALID_EXTENSION_STATUS):
         status = EXTENSION_STATUS_ERROR
 
     applied_time = status_data.get('configurationAppliedTime')
@@ -162,26 +256,32 @@ def migrate_handler_state():
      - This move can cause v2.1.x agents to multiply invoke a handler's install command. It also makes
        clean-up more difficult since the agent must remove the state as well as the handler directory.
     """
-    handler_state_path = os.path.join(conf.get_lib_dir(), "handler_state")
+    lib_dir = conf.get_lib_dir()
+    handler_state_path = os.path.join(lib_dir, "handler_state")
     if not os.path.isdir(handler_state_path):
         return
 
-    for handler_path in glob.iglob(os.path.join(handler_state_path, "*")):
-        handler = os.path.basename(handler_path)
-        handler_config_path = os.path.join(conf.get_lib_dir(), handler, "config")
+    handlers = [entry.name for entry in scandir(handler_state_path) if entry.is_dir(follow_symlinks=False)]
+    for handler in handlers:
+        handler_config_path = os.path.join(lib_dir, handler, "config")
         if os.path.isdir(handler_config_path):
             for file in ("State", "Status"):
                 from_path = os.path.join(handler_state_path, handler, file.lower())
                 to_path = os.path.join(handler_config_path, "Handler" + file)
-                if os.path.isfile(from_path) and not os.path.isfile(to_path):
+                if not os.path.lexists(to_path):
                     try:
                         shutil.move(from_path, to_path)
                     except Exception as e:
-                        logger.warn(
-                            "Exception occurred migrating {0} {1} file: {2}",
-                            handler,
-                            file,
-                            str(e))
+                        # A missing source file simply means there is nothing to migrate
+                        if getattr(e, "errno", None) != errno.ENOENT:
+                            logger.warn(
+                                "Exception occurred migrating {0} {1} file: {2}",
+                                handler,
+                                file,
+                                str(e))
+
+    # The migrated states are not known to the cached installed versions
+    ExtHandlerInstance._installed_versions.clear()
 
     try:
         shutil.rmtree(handler_state_path)
@@ -210,6 +310,12 @@ class ExtHandlersHandler(object):
         self.log_report = False
         self.log_etag = True
         self.log_process = False
+        self.last_agent_status_json = None
+        self.last_reported_ext_handlers = None
+        self.last_reported_status = None
+        self.last_report_time = None
+        # The wall-clock time (as written to waagent_status.json) of the last confirmed status upload
+        self.last_status_upload_time = None
 
         self.report_status_error_state = ErrorState()
         self.get_artifact_error_state = ErrorState(min_timedelta=ERROR_STATE_DELTA_INSTALL)
@@ -222,7 +328,7 @@ class ExtHandlersHandler(object):
             self.get_artifact_error_state.reset()
         except Exception as e:
             msg = u"Exception retrieving extension handlers: {0}".format(ustr(e))
-            detailed_msg = '{0} {1}'.format(msg, traceback.extract_tb(get_traceback(e)))
+            detailed_msg = '{0} {1}'.format(msg, _format_traceback())
 
             self.get_artifact_error_state.incr()
 
@@ -258,7 +364,7 @@ class ExtHandlersHandler(object):
             self.cleanup_outdated_handlers()
         except Exception as e:
             msg = u"Exception processing extension handlers: {0}".format(ustr(e))
-            detailed_msg = '{0} {1}'.format(msg, traceback.extract_tb(get_traceback(e)))
+            detailed_msg = '{0} {1}'.format(msg, _format_traceback())
             logger.warn(msg)
             add_event(AGENT_NAME,
                       version=CURRENT_VERSION,
@@ -268,61 +374,59 @@ class ExtHandlersHandler(object):
             return
 
     def cleanup_outdated_handlers(self):
-        handlers = []
-        pkgs = []
+        lib_dir = conf.get_lib_dir()
+
+        # Classify the entries of the lib dir with a single directory scan; the
+        # entries cache their file type so no additional stat calls are needed
+        dir_names = set()
+        file_names = []
+        for entry in scandir(lib_dir):
+            if version.is_agent_package(entry.name) or version.is_agent_path(entry.name):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                dir_names.add(entry.name)
+            elif entry.is_file(follow_symlinks=False):
+                file_names.append(entry.name)
 
-        # Build a collection of uninstalled handlers and orphaned packages
+        # First, remove the orphaned packages
         # Note:
         # -- An orphaned package is one without a corresponding handler
         #    directory
-        for item in os.listdir(conf.get_lib_dir()):
-            path = os.path.join(conf.get_lib_dir(), item)
-
-            if version.is_agent_package(path) or version.is_agent_path(path):
+        for item in file_names:
+            if item[0:-len(HANDLER_PKG_EXT)] in dir_names or not HANDLER_PKG_PATTERN.match(item):
                 continue
-
-            if os.path.isdir(path):
-                if re.match(HANDLER_NAME_PATTERN, item) is None:
-                    continue
-                try:
-                    eh = ExtHandler()
-
-                    separator = item.rfind('-')
-
-                    eh.name = item[0:separator]
-                    eh.properties.version = str(FlexibleVersion(item[separator + 1:]))
-
-                    handler = ExtHandlerInstance(eh, self.protocol)
-                except Exception:
-                    continue
-                if handler.get_handler_state() != ExtHandlerState.NotInstalled:
-                    continue
-                handlers.append(handler)
-
-            elif os.path.isfile(path) and \
-                    not os.path.isdir(path[0:-len(HANDLER_PKG_EXT)]):
-                if not re.match(HANDLER_PKG_PATTERN, item):
-                    continue
-                pkgs.append(path)
-
-        # Then, remove the orphaned packages
-        for pkg in pkgs:
+            pkg = os.path.join(lib_dir, item)
             try:
                 os.remove(pkg)
                 logger.verbose("Removed orphaned extension package {0}".format(pkg))
             except OSError as e:
                 logger.warn("Failed to remove orphaned package {0}: {1}".format(pkg, e.strerror))
 
-        # Finally, remove the directories and packages of the
-        # uninstalled handlers
-        for handler in handlers:
+        # Then, remove the directories and packages of the uninstalled handlers
+        for item in dir_names:
+            match = HANDLER_NAME_PATTERN.match(item)
+            if match is None:
+                continue
+            try:
+                eh = ExtHandler()
+
+                # The pattern already guarantees a dotted numeric version
+                eh.name, eh.properties.version = match.group(1), match.group(2)
+
+                handler = ExtHandlerInstance(eh, self.protocol)
+            except Exception:
+                continue
+            if handler.get_handler_state() != ExtHandlerState.NotInstalled:
+                continue
+
             handler.remove_ext_handler()
-            pkg = os.path.join(conf.get_lib_dir(), handler.get_full_name() + HANDLER_PKG_EXT)
-            if os.path.isfile(pkg):
-                try:
-                    os.remove(pkg)
-                    logger.verbose("Removed extension package {0}".format(pkg))
-                except OSError as e:
+            pkg = os.path.join(lib_dir, handler.get_full_name() + HANDLER_PKG_EXT)
+            try:
+                os.remove(pkg)
+                logger.verbose("Removed extension package {0}".format(pkg))
+            except OSError as e:
+                # The package may have already been removed
+                if e.errno != errno.ENOENT:
                     logger.warn("Failed to remove extension package {0}: {1}".format(pkg, e.strerror))
 
     def extension_processing_allowed(self):
@@ -342,23 +446,25 @@ class ExtHandlersHandler(object):
         return True
 
     def handle_ext_handlers(self, etag=None):
-        if self.ext_handlers.extHandlers is None or \
-                len(self.ext_handlers.extHandlers) == 0:
+        if not self.ext_handlers.extHandlers:
             logger.verbose("No extension handler config found")
             return
 
-        wait_until = datetime.datetime.utcnow() + datetime.timedelta(minutes=DEFAULT_EXT_TIMEOUT_MINUTES)
-        max_dep_level = max([handler.sort_key() for handler in self.ext_handlers.extHandlers])
+        wait_until = monotonic() + DEFAULT_EXT_TIMEOUT_MINUTES * 60
 
-        self.ext_handlers.extHandlers.sort(key=operator.methodcaller('sort_key'))
-        for ext_handler in self.ext_handlers.extHandlers:
+        # Compute the sort key of each handler only once
+        keyed_handlers = [(handler, handler.sort_key()) for handler in self.ext_handlers.extHandlers]
+        keyed_handlers.sort(key=operator.itemgetter(1))
+        max_dep_level = keyed_handlers[-1][1]
+        self.ext_handlers.extHandlers[:] = [handler for handler, _ in keyed_handlers]
+
+        for ext_handler, dep_level in keyed_handlers:
             self.handle_ext_handler(ext_handler, etag)
 
             # Wait for the extension installation until it is handled.
             # This is done for the install and enable. Not for the uninstallation.
             # If handled successfully, proceed with the current handler.
             # Otherwise, skip the rest of the extension installation.
-            dep_level = ext_handler.sort_key()
             if dep_level >= 0 and dep_level < max_dep_level:
                 if not self.wait_for_handler_successful_completion(ext_handler, wait_until):
                     logger.warn("An extension failed or timed out, will skip processing the rest of the extensions")
@@ -367,21 +473,28 @@ class ExtHandlersHandler(object):
     def wait_for_handler_successful_completion(self, ext_handler, wait_until):
         '''
         Check the status of the extension being handled.
-        Wait until it has a terminal state or times out.
+        Wait until it has a terminal state or times out; wait_until is a deadline on the monotonic() clock.
         Return True if it is handled successfully. False if not.
         '''
         handler_i = ExtHandlerInstance(ext_handler, self.protocol)
         for ext in ext_handler.properties.extensions:
             ext_completed, status = handler_i.is_ext_handling_complete(ext)
 
-            # Keep polling for the extension status until it becomes success or times out
-            while not ext_completed and datetime.datetime.utcnow() <= wait_until:
-                time.sleep(5)
+            # Keep polling for the extension status until it becomes success or times out.
+            # The poll interval backs off exponentially so that quickly completing extensions
+            # are picked up early, while long running ones are not polled more than needed.
+            delay = STATUS_POLL_MIN_INTERVAL
+            while not ext_completed:
+                remaining = wait_until - monotonic()
+                if remaining < 0:
+                    break
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, STATUS_POLL_MAX_INTERVAL)
                 ext_completed, status = handler_i.is_ext_handling_complete(ext)
 
             # In case of timeout or terminal error state, we log it and return false
             # so that the extensions waiting on this one can be skipped processing
-            if datetime.datetime.utcnow() > wait_until:
+            if monotonic() > wait_until:
                 msg = "Extension {0} did not reach a terminal state within the allowed timeout. Last status was {1}".format(
                     ext.name, status)
                 logger.warn(msg)
@@ -560,10 +673,11 @@ class ExtHandlersHandler(object):
         Go through handler_state dir, collect and report status
         """
         vm_status = VMStatus(status="Ready", message="Guest Agent is running")
+        ext_statuses = []
         if self.ext_handlers is not None:
             for ext_handler in self.ext_handlers.extHandlers:
                 try:
-                    self.report_ext_handler_status(vm_status, ext_handler)
+                    self.report_ext_handler_status(vm_status, ext_handler, ext_statuses)
                 except ExtensionError as e:
                     add_event(
                         AGENT_NAME,
@@ -572,12 +686,34 @@ class ExtHandlersHandler(object):
                         is_success=False,
                         message=ustr(e))
 
+        # Convert VMStatus class to Dict only once; it is used both to detect changes
+        # and to write the status file
+        vm_status_data = get_properties(vm_status)
+
+        # The status is re-sent only if it changed, if the goal state changed, or if
+        # the last report is older than MIN_STATUS_REPORT_INTERVAL
+        # (a negative elapsed time means the clock went backwards and is treated as expired)
+        status_fingerprint = _json_dumps([vm_status_data, ext_statuses])
+        if self.ext_handlers is self.last_reported_ext_handlers and \
+                status_fingerprint == self.last_reported_status and \
+                0 <= monotonic() - self.last_report_time < MIN_STATUS_REPORT_INTERVAL:
+            logger.verbose("VM agent status is unchanged, skipping report")
+            self.write_ext_handlers_status_to_info_file(vm_status_data)
+            return
+
         logger.verbose("Report vm agent status")
         try:
-            self.protocol.report_vm_status(vm_status)
+            uploaded = self.protocol.report_vm_status(vm_status)
             if self.log_report:
                 logger.verbose("Completed vm agent status report")
             self.report_status_error_state.reset()
+            # Remember the status only if the upload was confirmed, so that a deferred
+            # upload is retried on the next iteration
+            if uploaded:
+                self.last_reported_ext_handlers = self.ext_handlers
+                self.last_reported_status = status_fingerprint
+                self.last_report_time = monotonic()
+                self.last_status_upload_time = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
         except ProtocolNotFoundError as e:
             self.report_status_error_state.incr()
             message = "Failed to report vm agent status: {0}".format(e)
@@ -603,10 +739,13 @@ class ExtHandlersHandler(object):
 
             self.report_status_error_state.reset()
 
-        self.write_ext_handlers_status_to_info_file(vm_status)
+        self.write_ext_handlers_status_to_info_file(vm_status_data)
 
-    @staticmethod
-    def write_ext_handlers_status_to_info_file(vm_status):
+    def write_ext_handlers_status_to_info_file(self, data):
+        """
+        Write a summary of the agent status to waagent_status.json; data is the VMStatus as
+        returned by get_properties()
+        """
         status_path = os.path.join(conf.get_lib_dir(), AGENT_STATUS_FILE)
 
         agent_details = {
@@ -614,30 +753,30 @@ class ExtHandlersHandler(object):
             "current_version": str(CURRENT_VERSION),
             "goal_state_version": str(GOAL_STATE_AGENT_VERSION),
             "distro_details": "{0}:{1}".format(DISTRO_NAME, DISTRO_VERSION),
-            "last_successful_status_upload_time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "last_successful_status_upload_time": self.last_status_upload_time,
             "python_version": "Python: {0}.{1}.{2}".format(PY_VERSION_MAJOR, PY_VERSION_MINOR, PY_VERSION_MICRO)
         }
 
-        # Convert VMStatus class to Dict.
-        data = get_properties(vm_status)
-
-        # The above class contains vmAgent.extensionHandlers
+        # The VMStatus contains vmAgent.extensionHandlers
         # (more info: azurelinuxagent.common.protocol.restapi.VMAgentStatus)
-        handler_statuses = data['vmAgent']['extensionHandlers']
-        for handler_status in handler_statuses:
-            try:
-                handler_status.pop('code', None)
-                handler_status.pop('message', None)
-                handler_status.pop('extensions', None)
-            except KeyError:
-                pass
+        # Only a summary of each handler status is written to the file
+        handler_statuses = [dict((k, v) for k, v in handler_status.items() if k not in AGENT_STATUS_DROP_KEYS)
+                            for handler_status in data['vmAgent']['extensionHandlers']]
 
         agent_details['extensions_status'] = handler_statuses
-        agent_details_json = json.dumps(agent_details)
+        agent_details_json = _json_dumps(agent_details)
+
+        # Skip the write if the file already has this content
+        if agent_details_json == self.last_agent_status_json and os.path.isfile(status_path):
+            return
 
-        fileutil.write_file(status_path, agent_details_json)
+        # Write to a temporary file and rename it so that readers never see a partially written file
+        tmp_path = status_path + ".tmp"
+        fileutil.write_file(tmp_path, agent_details_json)
+        os.rename(tmp_path, status_path)
+        self.last_agent_status_json = agent_details_json
 
-    def report_ext_handler_status(self, vm_status, ext_handler):
+    def report_ext_handler_status(self, vm_status, ext_handler, ext_statuses=None):
         ext_handler_i = ExtHandlerInstance(ext_handler, self.protocol)
 
         handler_status = ext_handler_i.get_handler_status()
@@ -647,7 +786,7 @@ class ExtHandlersHandler(object):
         handler_state = ext_handler_i.get_handler_state()
         if handler_state != ExtHandlerState.NotInstalled:
             try:
-                active_exts = ext_handler_i.report_ext_status()
+                active_exts = ext_handler_i.report_ext_status(ext_statuses)
                 handler_status.extensions.extend(active_exts)
             except ExtensionError as e:
                 ext_handler_i.set_handler_status(message=ustr(e), code=e.code)
@@ -663,6 +802,24 @@ class ExtHandlersHandler(object):
 
 
 class ExtHandlerInstance(object):
+    # The CommandExecution.log appender of each extension log dir; instances are created
+    # many times per goal state, but the appender only needs to be created once per process
+    _log_appenders = {}
+
+    # The last installed version found for each (lib dir, handler name); the lib dir is
+    # modified by the agent on every iteration, so rather than being validated against it
+    # an entry is dropped whenever the agent changes the state of the handler
+    _installed_versions = {}
+
+    # The settings files last written to each config dir, keyed by path, along with the
+    # content written and the (inode, size, mtime) of the file after it was written
+    _written_settings = {}
+
+    # The last manifest loaded from each manifest file, keyed by its path, along with the
+    # (inode, size, mtime) of the file when it was loaded; a manifest rarely changes once
+    # the handler is installed, but it is loaded by every handler operation
+    _manifests = {}
+
     def __init__(self, ext_handler, protocol):
         self.ext_handler = ext_handler
         self.protocol = protocol
@@ -671,16 +828,34 @@ class ExtHandlerInstance(object):
         self.pkg_file = None
         self.is_upgrade = False
         self.logger = None
-        self.set_logger()
 
-        try:
-            fileutil.mkdir(self.get_log_dir(), mode=0o755)
-        except IOError as e:
-            self.logger.error(u"Failed to create extension log dir: {0}", e)
+        # The paths of the handler, cached along with the values they were derived from;
+        # they are recomputed whenever the handler version (set by decide_version) or
+        # the agent directories change
+        self._full_name_cache = None
+        self._base_dir_cache = None
+        self._base_dir_paths_cache = (None, {})
+        self._log_dir_cache = None
 
-        log_file = os.path.join(self.get_log_dir(), "CommandExecution.log")
-        self.logger.add_appender(logger.AppenderType.FILE,
-                                 logger.LogLevel.INFO, log_file)
+        self.set_logger()
+
+        # The last status read from each status file, keyed by its path, along with
+        # the (inode, size, mtime) of the file when the status was read
+        self.handling_statuses = {}
+
+        log_dir = self.get_log_dir()
+        appender = ExtHandlerInstance._log_appenders.get(log_dir)
+        # The log dir is handed to the extension and may have been removed (e.g. by its
+        # uninstall), so it is recreated whenever it is missing
+        if appender is None or not os.path.isdir(log_dir):
+            if appender is None:
+                appender = logger.FileAppender(logger.LogLevel.INFO, os.path.join(log_dir, "CommandExecution.log"))
+            try:
+                fileutil.mkdir(log_dir, mode=0o755)
+                ExtHandlerInstance._log_appenders[log_dir] = appender
+            except IOError as e:
+                self.logger.error(u"Failed to create extension log dir: {0}", e)
+        self.logger.appenders.append(appender)
 
     def decide_version(self, target_state=None):
         self.logger.verbose("Decide which version to use")
@@ -703,15 +878,25 @@ class ExtHandlerInstance(object):
         # - Find the installed package (its version must exactly match)
         # - Find the internal candidate (its version must exactly match)
         # - Separate the public packages
+        # Each package version is parsed only once and reused below
         selected_pkg = None
+        selected_pkg_version = None
         installed_pkg = None
-        pkg_list.versions.sort(key=lambda p: FlexibleVersion(p.version))
-        for pkg in pkg_list.versions:
-            pkg_version = FlexibleVersion(pkg.version)
-            if pkg_version == installed_version:
+        installed_pkg_version = None
+        versioned_pkgs = [(FlexibleVersion(pkg.version), pkg) for pkg in pkg_list.versions]
+        versioned_pkgs.sort(key=operator.itemgetter(0))
+        pkg_list.versions[:] = [pkg for _, pkg in versioned_pkgs]
+        # Walk the packages from the highest version down: the first match is the
+        # highest matching version, so the walk stops once both packages are found
+        for pkg_version, pkg in reversed(versioned_pkgs):
+            if installed_pkg is None and pkg_version == installed_version:
                 installed_pkg = pkg
-            if requested_version.matches(pkg_version):
+                installed_pkg_version = pkg_version
+            if selected_pkg is None and requested_version.matches(pkg_version):
                 selected_pkg = pkg
+                selected_pkg_version = pkg_version
+            if installed_pkg is not None and selected_pkg is not None:
+                break
 
         # Finally, update the version only if not downgrading
         # Note:
@@ -723,17 +908,18 @@ class ExtHandlerInstance(object):
                       "to uninstall".format(self.ext_handler.name)
                 self.logger.warn(msg)
             self.pkg = installed_pkg
+            pkg_version = installed_pkg_version
             self.ext_handler.properties.version = str(installed_version) \
                 if installed_version is not None else None
         else:
             self.pkg = selected_pkg
+            pkg_version = selected_pkg_version
             if self.pkg is not None:
                 self.ext_handler.properties.version = str(selected_pkg.version)
 
         # Note if the selected package is different than that installed
         if installed_pkg is None \
-                or (
-                self.pkg is not None and FlexibleVersion(self.pkg.version) != FlexibleVersion(installed_pkg.version)):
+                or (self.pkg is not None and pkg_version != installed_pkg_version):
             self.is_upgrade = True
 
         if self.pkg is not None:
@@ -766,19 +952,33 @@ class ExtHandlerInstance(object):
         return ExtHandlerInstance(installed_handler, self.protocol)
 
     def get_installed_version(self):
+        # The lib dir is only scanned again if the handler state was changed since the
+        # last scan (see invalidate_installed_version)
+        lib_dir = conf.get_lib_dir()
+        key = (lib_dir, self.ext_handler.name)
+        if key in ExtHandlerInstance._installed_versions:
+            return ExtHandlerInstance._installed_versions[key]
+
         lastest_version = None
 
-        for path in glob.iglob(os.path.join(conf.get_lib_dir(), self.ext_handler.name + "-*")):
-            if not os.path.isdir(path):
+        prefix = self.ext_handler.name + "-"
+        for entry in scandir(lib_dir):
+            if not entry.name.startswith(prefix) or not entry.is_dir():
                 continue
 
-            separator = path.rfind('-')
-            version_from_path = FlexibleVersion(path[separator + 1:])
+            path = entry.path
+            separator = entry.name.rfind('-')
+            version_from_path = FlexibleVersion(entry.name[separator + 1:])
             state_path = os.path.join(path, 'config', 'HandlerState')
 
-            if not os.path.exists(state_path) or \
-                    fileutil.read_file(state_path) == \
-                    ExtHandlerState.NotInstalled:
+            try:
+                state = fileutil.read_file(state_path)
+            except (IOError, OSError) as e:
+                if e.errno != errno.ENOENT:
+                    raise
+                state = None
+
+            if state is None or state == ExtHandlerState.NotInstalled:
                 logger.verbose("Ignoring version of uninstalled extension: "
                                "{0}".format(path))
                 continue
@@ -786,7 +986,12 @@ class ExtHandlerInstance(object):
             if lastest_version is None or lastest_version < version_from_path:
                 lastest_version = version_from_path
 
-        return str(lastest_version) if lastest_version is not None else None
+        installed_version = str(lastest_version) if lastest_version is not None else None
+        ExtHandlerInstance._installed_versions[key] = installed_version
+        return installed_version
+
+    def invalidate_installed_version(self):
+        ExtHandlerInstance._installed_versions.pop((conf.get_lib_dir(), self.ext_handler.name), None)
 
     def copy_status_files(self, old_ext_handler_i):
         self.logger.info("Copy status files from old plugin to new")
@@ -801,10 +1006,9 @@ class ExtHandlerInstance(object):
         new_ext_status_dir = self.get_status_dir()
 
         if os.path.isdir(old_ext_status_dir):
-            for status_file in os.listdir(old_ext_status_dir):
-                status_file = os.path.join(old_ext_status_dir, status_file)
-                if os.path.isfile(status_file):
-                    shutil.copy2(status_file, new_ext_status_dir)
+            for entry in scandir(old_ext_status_dir):
+                if entry.is_file():
+                    shutil.copy2(entry.path, new_ext_status_dir)
 
     def set_operation(self, op):
         self.operation = op
@@ -830,7 +1034,12 @@ class ExtHandlerInstance(object):
     def _unzip_extension_package(self, source_file, target_directory):
         self.logger.info("Unzipping extension package: {0}", source_file)
         try:
-            zipfile.ZipFile(source_file).extractall(target_directory)
+            # ZipFile is not a context manager on Python 2.6, so the archive is closed explicitly
+            package = zipfile.ZipFile(source_file)
+            try:
+                package.extractall(target_directory)
+            finally:
+                package.close()
         except Exception as exception:
             logger.info("Error while unzipping extension package: {0}", ustr(exception))
             os.remove(source_file)
@@ -840,7 +1049,7 @@ class ExtHandlerInstance(object):
         return True
 
     def download(self):
-        begin_utc = datetime.datetime.utcnow()
+        begin = monotonic()
         self.set_operation(WALAEventOperation.Download)
 
         if self.pkg is None or self.pkg.uris is None or len(self.pkg.uris) == 0:
@@ -874,15 +1083,17 @@ class ExtHandlerInstance(object):
                 if downloaded:
                     break
 
-                self.logger.info("Failed to download the extension package from all uris, will retry after a minute")
-                time.sleep(60)
+                # There is no point in waiting after the last round
                 i += 1
+                if i < NUMBER_OF_DOWNLOAD_RETRIES:
+                    self.logger.info("Failed to download the extension package from all uris, will retry after a minute")
+                    time.sleep(60)
 
             if not downloaded:
                 raise ExtensionDownloadError("Failed to download extension",
                                              code=ExtensionErrorCodes.PluginManifestDownloadError)
 
-            duration = elapsed_milliseconds(begin_utc)
+            duration = _elapsed_milliseconds(begin)
             self.report_event(message="Download succeeded", duration=duration)
 
         self.pkg_file = destination
@@ -891,18 +1102,25 @@ class ExtHandlerInstance(object):
         self.logger.info("Initializing extension {0}".format(self.get_full_name()))
 
         # Add user execute permission to all files under the base dir
-        for file in fileutil.get_all_files(self.get_base_dir()):
-            fileutil.chmod(file, os.stat(file).st_mode | stat.S_IXUSR)
+        fileutil.add_mode_to_tree(self.get_base_dir(), stat.S_IXUSR)
 
-        # Save HandlerManifest.json
-        man_file = fileutil.search_file(self.get_base_dir(), 'HandlerManifest.json')
+        # Save HandlerManifest.json; it is usually at the root of the package already, in
+        # which case it only needs to be rewritten if it starts with a BOM
+        target_man_file = self.get_manifest_file()
+        if os.path.isfile(target_man_file):
+            man_file = target_man_file
+        else:
+            man_file = fileutil.search_file(self.get_base_dir(), 'HandlerManifest.json')
 
         if man_file is None:
             raise ExtensionDownloadError("HandlerManifest.json not found")
 
         try:
-            man = fileutil.read_file(man_file, remove_bom=True)
-            fileutil.write_file(self.get_manifest_file(), man)
+            man = fileutil.read_file(man_file, asbin=True)
+            man_without_bom = textutil.remove_bom(man)
+            self.invalidate_manifest()
+            if man_file != target_man_file or len(man_without_bom) != len(man):
+                fileutil.write_file(target_man_file, man_without_bom, asbin=True)
         except IOError as e:
             fileutil.clean_ioerror(e, paths=[self.get_base_dir(), self.pkg_file])
             raise ExtensionDownloadError(u"Failed to save HandlerManifest.json", e)
@@ -985,14 +1203,16 @@ class ExtHandlerInstance(object):
         self.launch_command(uninstall_cmd)
 
     def remove_ext_handler(self):
+        self.invalidate_installed_version()
+        self.invalidate_manifest()
         try:
-            zip_filename = "__".join(os.path.basename(self.get_base_dir()).split("-")) + ".zip"
+            base_dir = self.get_base_dir()
+            zip_filename = "__".join(os.path.basename(base_dir).split("-")) + ".zip"
             destination = os.path.join(conf.get_lib_dir(), zip_filename)
             if os.path.exists(destination):
                 self.pkg_file = destination
                 os.remove(self.pkg_file)
 
-            base_dir = self.get_base_dir()
             if os.path.isdir(base_dir):
                 self.logger.info("Remove extension handler directory: {0}",
                                  base_dir)
@@ -1000,7 +1220,7 @@ class ExtHandlerInstance(object):
                 # some extensions uninstall asynchronously so ignore error 2 while removing them
                 def on_rmtree_error(_, __, exc_info):
                     _, exception, _ = exc_info
-                    if not isinstance(exception, OSError) or exception.errno != 2:  # [Errno 2] No such file or directory
+                    if not isinstance(exception, OSError) or exception.errno != errno.ENOENT:
                         raise exception
 
                 shutil.rmtree(base_dir, onerror=on_rmtree_error)
@@ -1045,19 +1265,18 @@ class ExtHandlerInstance(object):
 
     def get_largest_seq_no(self):
         seq_no = -1
-        conf_dir = self.get_conf_dir()
-        for item in os.listdir(conf_dir):
-            item_path = os.path.join(conf_dir, item)
-            if os.path.isfile(item_path):
-                try:
-                    separator = item.rfind(".")
-                    if separator > 0 and item[separator + 1:] == 'settings':
-                        curr_seq_no = int(item.split('.')[0])
-                        if curr_seq_no > seq_no:
-                            seq_no = curr_seq_no
-                except (ValueError, IndexError, TypeError):
-                    self.logger.verbose("Failed to parse file name: {0}", item)
-                    continue
+        for entry in scandir(self.get_conf_dir()):
+            item = entry.name
+            name, _, extension = item.rpartition(".")
+            if not name or extension != 'settings' or not entry.is_file():
+                continue
+            try:
+                curr_seq_no = int(item.partition('.')[0])
+            except ValueError:
+                self.logger.verbose("Failed to parse file name: {0}", item)
+                continue
+            if curr_seq_no > seq_no:
+                seq_no = curr_seq_no
         return seq_no
 
     def get_status_file_path(self, extension=None):
@@ -1088,17 +1307,22 @@ class ExtHandlerInstance(object):
 
         return seq_no, path
 
-    def collect_ext_status(self, ext):
+    def collect_ext_status(self, ext, seq_no=None, ext_status_file=None):
+        """
+        Read the status of the given extension. Callers that already looked up the status file
+        of the extension can pass its sequence number and path to avoid scanning the config dir again.
+        """
         self.logger.verbose("Collect extension status")
 
-        seq_no, ext_status_file = self.get_status_file_path(ext)
+        if seq_no is None:
+            seq_no, ext_status_file = self.get_status_file_path(ext)
         if seq_no == -1:
             return None
 
         ext_status = ExtensionStatus(seq_no=seq_no)
         try:
             data_str = fileutil.read_file(ext_status_file)
-            data = json.loads(data_str)
+            data = _json_loads(data_str)
             parse_ext_status(ext_status, data)
         except IOError as e:
             ext_status.message = u"Failed to get status file {0}".format(e)
@@ -1122,11 +1346,19 @@ class ExtHandlerInstance(object):
 
         # Missing status file is considered a non-terminal state here
         # so that extension sequencing can wait until it becomes existing
-        if not os.path.exists(ext_status_file):
-            status = "warning"
-        else:
-            ext_status = self.collect_ext_status(ext)
-            status = ext_status.status if ext_status is not None else None
+        signature = _file_signature(ext_status_file)
+        if signature is None:
+            return "warning"
+
+        # While waiting on an extension the status file is checked repeatedly; it
+        # is only read and parsed again if it has been modified since the last check
+        cached = self.handling_statuses.get(ext_status_file)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        ext_status = self.collect_ext_status(ext, seq_no, ext_status_file)
+        status = ext_status.status if ext_status is not None else None
+        self.handling_statuses[ext_status_file] = (signature, status)
 
         return status
 
@@ -1144,7 +1376,11 @@ class ExtHandlerInstance(object):
         # Extension completed, return its status
         return (True, status)
 
-    def report_ext_status(self):
+    def report_ext_status(self, ext_statuses=None):
+        """
+        Report the status of each extension to the protocol and return the names of the reported extensions.
+        If ext_statuses is given, the properties of each reported status are appended to it.
+        """
         active_exts = []
         # TODO Refactor or remove this common code pattern (for each extension subordinate to an ext_handler, do X).
         for ext in self.ext_handler.properties.extensions:
@@ -1155,6 +1391,8 @@ class ExtHandlerInstance(object):
                 self.protocol.report_ext_status(self.ext_handler.name, ext.name,
                                                 ext_status)
                 active_exts.append(ext.name)
+                if ext_statuses is not None:
+                    ext_statuses.append(get_properties(ext_status))
             except ProtocolError as e:
                 self.logger.error(u"Failed to report extension status: {0}", e)
         return active_exts
@@ -1176,7 +1414,7 @@ class ExtHandlerInstance(object):
             }
         try:
             heartbeat_json = fileutil.read_file(heartbeat_file)
-            heartbeat = json.loads(heartbeat_json)[0]['heartbeat']
+            heartbeat = _json_loads(heartbeat_json)[0]['heartbeat']
         except IOError as e:
             raise ExtensionError("Failed to get heartbeat file:{0}".format(e))
         except (ValueError, KeyError) as e:
@@ -1196,7 +1434,7 @@ class ExtHandlerInstance(object):
 
     def launch_command(self, cmd, timeout=300, extension_error_code=ExtensionErrorCodes.PluginProcessingError,
                        env=None):
-        begin_utc = datetime.datetime.utcnow()
+        begin = monotonic()
         self.logger.verbose("Launch command: [{0}]", cmd)
 
         base_dir = self.get_base_dir()
@@ -1207,7 +1445,7 @@ class ExtHandlerInstance(object):
                     env = {}
                 env.update(os.environ)
                 # Always add Extension Path and version to the current launch_command (Ask from publishers)
-                env.update({EXTENSION_PATH: self.get_base_dir(),
+                env.update({EXTENSION_PATH: base_dir,
                             EXTENSION_VERSION: self.ext_handler.properties.version})
 
                 try:
@@ -1230,8 +1468,8 @@ class ExtHandlerInstance(object):
                     raise ExtensionOperationError("Failed to launch '{0}': {1}".format(full_path, e.strerror),
                                                   code=extension_error_code)
 
-                duration = elapsed_milliseconds(begin_utc)
-                log_msg = "{0}\n{1}".format(cmd, "\n".join([line for line in process_output.split('\n') if line != ""]))
+                duration = _elapsed_milliseconds(begin)
+                log_msg = "{0}\n{1}".format(cmd, "\n".join(filter(None, process_output.split('\n'))))
 
                 self.logger.verbose(log_msg)
                 self.report_event(message=log_msg, duration=duration, log_event=False)
@@ -1240,8 +1478,14 @@ class ExtHandlerInstance(object):
 
     def load_manifest(self):
         man_file = self.get_manifest_file()
+
+        signature = _file_signature(man_file)
+        cached = ExtHandlerInstance._manifests.get(man_file)
+        if signature is not None and cached is not None and cached[0] == signature:
+            return cached[1]
+
         try:
-            data = json.loads(fileutil.read_file(man_file))
+            data = _json_loads(fileutil.read_file(man_file))
         except (IOError, OSError) as e:
             raise ExtensionError('Failed to load manifest file ({0}): {1}'.format(man_file, e.strerror),
                                  code=ExtensionErrorCodes.PluginHandlerManifestNotFound)
@@ -1249,7 +1493,13 @@ class ExtHandlerInstance(object):
             raise ExtensionError('Malformed manifest file ({0}).'.format(man_file),
                                  code=ExtensionErrorCodes.PluginHandlerManifestDeserializationError)
 
-        return HandlerManifest(data[0])
+        manifest = HandlerManifest(data[0])
+        if signature is not None:
+            ExtHandlerInstance._manifests[man_file] = (signature, manifest)
+        return manifest
+
+    def invalidate_manifest(self):
+        ExtHandlerInstance._manifests.pop(self.get_manifest_file(), None)
 
     def update_settings_file(self, settings_file, settings):
         settings_file = os.path.join(self.get_conf_dir(), settings_file)
@@ -1261,12 +1511,32 @@ class ExtHandlerInstance(object):
             raise ExtensionError(u"Failed to update settings file", e)
 
     def update_settings(self):
+        # The settings are written on every enable, but they rarely change; a settings file
+        # is not written again if it still has the content that was last written to it
+        conf_dir = self.get_conf_dir()
+        previous = ExtHandlerInstance._written_settings.get(conf_dir, {})
+        written = {}
+        ExtHandlerInstance._written_settings[conf_dir] = written
+
+        def update_settings_file(settings_file, settings, message="Update settings file: {0}"):
+            settings_path = os.path.join(conf_dir, settings_file)
+            last_written = previous.get(settings_path)
+            if last_written is not None and last_written[0] == settings and \
+                    last_written[1] == _file_signature(settings_path):
+                self.logger.verbose("Settings file is unchanged, skipping update: {0}", settings_file)
+                written[settings_path] = last_written
+                return
+            self.logger.info(message, settings_file)
+            self.update_settings_file(settings_file, settings)
+            signature = _file_signature(settings_path)
+            if signature is not None:
+                written[settings_path] = (settings, signature)
+
         if self.ext_handler.properties.extensions is None or \
                 len(self.ext_handler.properties.extensions) == 0:
             # This is the behavior of waagent 2.0.x
             # The new agent has to be consistent with the old one.
-            self.logger.info("Extension has no settings, write empty 0.settings")
-            self.update_settings_file("0.settings", "")
+            update_settings_file("0.settings", "", "Extension has no settings, write empty {0}")
             return
 
         for ext in self.ext_handler.properties.extensions:
@@ -1281,8 +1551,7 @@ class ExtHandlerInstance(object):
                 }]
             }
             settings_file = "{0}.settings".format(ext.sequenceNumber)
-            self.logger.info("Update settings file: {0}", settings_file)
-            self.update_settings_file(settings_file, json.dumps(ext_settings))
+            update_settings_file(settings_file, json.dumps(ext_settings))
 
     def create_handler_env(self):
         env = [{
@@ -1303,6 +1572,7 @@ class ExtHandlerInstance(object):
             raise ExtensionDownloadError(u"Failed to save handler environment", e)
 
     def set_handler_state(self, handler_state):
+        self.invalidate_installed_version()
         state_dir = self.get_conf_dir()
         state_file = os.path.join(state_dir, "HandlerState")
         try:
@@ -1337,7 +1607,7 @@ class ExtHandlerInstance(object):
         status_file = os.path.join(state_dir, "HandlerStatus")
 
         try:
-            handler_status_json = json.dumps(get_properties(handler_status))
+            handler_status_json = _json_dumps(get_properties(handler_status))
             if handler_status_json is not None:
                 fileutil.write_file(status_file, handler_status_json)
             else:
@@ -1355,7 +1625,7 @@ class ExtHandlerInstance(object):
             return None
 
         try:
-            data = json.loads(fileutil.read_file(status_file))
+            data = _json_loads(fileutil.read_file(status_file))
             handler_status = ExtHandlerStatus()
             set_properties("ExtHandlerStatus", handler_status, data)
             return handler_status
@@ -1363,29 +1633,47 @@ class ExtHandlerInstance(object):
             self.logger.error("Failed to get handler status: {0}", e)
 
     def get_full_name(self):
-        return "{0}-{1}".format(self.ext_handler.name,
-                                self.ext_handler.properties.version)
+        key = (self.ext_handler.name, self.ext_handler.properties.version)
+        if self._full_name_cache is None or self._full_name_cache[0] != key:
+            self._full_name_cache = (key, "{0}-{1}".format(*key))
+        return self._full_name_cache[1]
 
     def get_base_dir(self):
-        return os.path.join(conf.get_lib_dir(), self.get_full_name())
+        key = (conf.get_lib_dir(), self.get_full_name())
+        if self._base_dir_cache is None or self._base_dir_cache[0] != key:
+            self._base_dir_cache = (key, os.path.join(*key))
+        return self._base_dir_cache[1]
+
+    def _get_base_dir_path(self, name):
+        base_dir = self.get_base_dir()
+        if self._base_dir_paths_cache[0] != base_dir:
+            self._base_dir_paths_cache = (base_dir, {})
+        paths = self._base_dir_paths_cache[1]
+        path = paths.get(name)
+        if path is None:
+            path = paths[name] = os.path.join(base_dir, name)
+        return path
 
     def get_status_dir(self):
-        return os.path.join(self.get_base_dir(), "status")
+        return self._get_base_dir_path("status")
 
     def get_conf_dir(self):
-        return os.path.join(self.get_base_dir(), 'config')
+        return self._get_base_dir_path('config')
 
     def get_heartbeat_file(self):
-        return os.path.join(self.get_base_dir(), 'heartbeat.log')
+        return self._get_base_dir_path('heartbeat.log')
 
     def get_manifest_file(self):
-        return os.path.join(self.get_base_dir(), 'HandlerManifest.json')
+        return self._get_base_dir_path('HandlerManifest.json')
 
     def get_env_file(self):
-        return os.path.join(self.get_base_dir(), 'HandlerEnvironment.json')
+        return self._get_base_dir_path('HandlerEnvironment.json')
 
     def get_log_dir(self):
-        return os.path.join(conf.get_ext_log_dir(), self.ext_handler.name)
+        key = (conf.get_ext_log_dir(), self.ext_handler.name)
+        if self._log_dir_cache is None or self._log_dir_cache[0] != key:
+            self._log_dir_cache = (key, os.path.join(*key))
+        return self._log_dir_cache[1]
 
 
 class HandlerEnvironment(object):
@@ -1409,40 +1697,52 @@ class HandlerEnvironment(object):
 
 
 class HandlerManifest(object):
+    # A manifest is loaded for each handler operation; slots keep the instances small
+    __slots__ = ('data', 'handler_manifest', 'name', 'version', 'report_heartbeat', 'update_with_install',
+                 'continue_on_update_failure')
+
     def __init__(self, data):
         if data is None or data['handlerManifest'] is None:
             raise ExtensionError('Malformed manifest file.')
         self.data = data
+        self.handler_manifest = data['handlerManifest']
+        self.name = data.get("name")
+        self.version = data.get("version")
+
+        # The flags are checked by most handler operations; they are computed once, when the manifest is loaded
+        self.report_heartbeat = bool(self.handler_manifest.get('reportHeartbeat'))
+        update_mode = self.handler_manifest.get('updateMode')
+        # a malformed (non-string) updateMode is treated as UpdateWithoutInstall rather than failing to load the manifest
+        self.update_with_install = update_mode is None or \
+            (isinstance(update_mode, (str, ustr)) and update_mode.lower() == "updatewithinstall")
+        self.continue_on_update_failure = bool(self.handler_manifest.get('continueOnUpdateFailure'))
 
     def get_name(self):
-        return self.data["name"]
+        return self.name
 
     def get_version(self):
-        return self.data["version"]
+        return self.version
 
     def get_install_command(self):
-        return self.data['handlerManifest']["installCommand"]
+        return self.handler_manifest["installCommand"]
 
     def get_uninstall_command(self):
-        return self.data['handlerManifest']["uninstallCommand"]
+        return self.handler_manifest["uninstallCommand"]
 
     def get_update_command(self):
-        return self.data['handlerManifest']["updateCommand"]
+        return self.handler_manifest["updateCommand"]
 
     def get_enable_command(self):
-        return self.data['handlerManifest']["enableCommand"]
+        return self.handler_manifest["enableCommand"]
 
     def get_disable_command(self):
-        return self.data['handlerManifest']["disableCommand"]
+        return self.handler_manifest["disableCommand"]
 
     def is_report_heartbeat(self):
-        return self.data['handlerManifest'].get('reportHeartbeat', False)
+        return self.report_heartbeat
 
     def is_update_with_install(self):
-        update_mode = self.data['handlerManifest'].get('updateMode')
-        if update_mode is None:
-            return True
-        return update_mode.lower() == "updatewithinstall"
+        return self.update_with_install
 
     def is_continue_on_update_failure(self):
-        return self.data['handlerManifest'].get('continueOnUpdateFailure', False)
+        return self.continue_on_update_failure
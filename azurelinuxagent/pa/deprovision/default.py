@@ -19,7 +19,6 @@
 
 import glob
 import os.path
-import re
 import signal
 import sys
 
@@ -123,13 +122,14 @@ class DeprovisionHandler(object):
                                          ["/var/lib/NetworkManager/dhclient-*.lease"]))
 
     def del_ext_handler_files(self, warnings, actions):
-        ext_dirs = [d for d in os.listdir(conf.get_lib_dir())
-                    if os.path.isdir(os.path.join(conf.get_lib_dir(), d))
-                    and re.match(HANDLER_NAME_PATTERN, d) is not None
-                    and not version.is_agent_path(d)]
+        lib_dir = conf.get_lib_dir()
+        ext_dirs = [d for d in os.listdir(lib_dir)
+                    if HANDLER_NAME_PATTERN.match(d) is not None
+                    and not version.is_agent_path(d)
+                    and os.path.isdir(os.path.join(lib_dir, d))]
 
         for ext_dir in ext_dirs:
-            ext_base = os.path.join(conf.get_lib_dir(), ext_dir)
+            ext_base = os.path.join(lib_dir, ext_dir)
             files = glob.glob(os.path.join(ext_base, 'status', '*.status'))
             files += glob.glob(os.path.join(ext_base, 'config', '*.settings'))
             files += glob.glob(os.path.join(ext_base, 'config', 'HandlerStatus'))
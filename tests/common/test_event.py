@@ -222,6 +222,33 @@ class TestEvent(AgentTestCase):
         for filename in os.listdir(self.tmp_dir):
             self.assertEqual(".tld", filename[-4:])
 
+    def test_save_event_creates_the_event_dir_once(self):
+        event_dir = os.path.join(self.tmp_dir, "events")
+        reporter = event.EventLogger()
+        reporter.event_dir = event_dir
+
+        with patch("azurelinuxagent.common.event.fileutil.mkdir", wraps=fileutil.mkdir) as patch_mkdir:
+            reporter.save_event("test event 1")
+            reporter.save_event("test event 2")
+            self.assertEqual(1, patch_mkdir.call_count)
+            self.assertEqual(2, len(os.listdir(event_dir)))
+
+            # the dir is created again if it is removed
+            shutil.rmtree(event_dir)
+            reporter.save_event("test event 3")
+            self.assertEqual(2, patch_mkdir.call_count)
+            self.assertEqual(1, len(os.listdir(event_dir)))
+
+    def test_save_event_enforces_the_mode_of_an_existing_event_dir(self):
+        event_dir = os.path.join(self.tmp_dir, "events")
+        os.mkdir(event_dir)
+        os.chmod(event_dir, 0o755)
+        reporter = event.EventLogger()
+        reporter.event_dir = event_dir
+
+        reporter.save_event("test event")
+        self.assertEqual(0o700, os.stat(event_dir).st_mode & 0o777)
+
     def test_save_event_message_with_non_ascii_characters(self):
         test_data_dir = os.path.join(data_dir, "events", "collect_and_send_extension_stdout_stderror")
         msg = ""
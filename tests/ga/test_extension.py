@@ -15,6 +15,7 @@
 # Requires Python 2.6+ and Openssl 1.0+
 #
 
+import glob
 import os.path
 
 from datetime import timedelta
@@ -23,6 +24,7 @@ from azurelinuxagent.ga.monitor import get_monitor_handler
 from nose.plugins.attrib import attr
 from tests.protocol.mockwiredata import *
 
+from azurelinuxagent.common.future import monotonic
 from azurelinuxagent.common.protocol.restapi import Extension, ExtHandlerProperties
 from azurelinuxagent.ga.exthandlers import *
 from azurelinuxagent.common.protocol.wire import WireProtocol, InVMArtifactsProfile
@@ -146,6 +148,56 @@ class TestExtensionCleanup(AgentTestCase):
         self.assertEqual(self._count_installed(), 5)
         self.assertEqual(self._count_uninstalled(), 0)
 
+    @patch("azurelinuxagent.ga.exthandlers.logger.warn")
+    @patch("azurelinuxagent.common.conf.get_lib_dir")
+    def test_cleanup_removes_uninstalled_extensions_without_packages(self, mock_conf, mock_warn):
+        mock_conf.return_value = self.lib_dir
+
+        self._install_handlers(start=0, count=5, handler_state=ExtHandlerState.NotInstalled)
+        for pkg in glob.glob(os.path.join(self.lib_dir, "*.zip")):
+            os.remove(pkg)
+
+        self.ext_handlers.cleanup_outdated_handlers()
+
+        self.assertEqual(self._count_uninstalled(), 0)
+        self.assertEqual(0, mock_warn.call_count)
+
+
+    @patch("azurelinuxagent.common.conf.get_lib_dir")
+    def test_get_installed_version_ignores_uninstalled_handlers(self, mock_conf):
+        mock_conf.return_value = self.lib_dir
+
+        self._install_handlers(start=0, count=2, handler_state=ExtHandlerState.Enabled)
+        self._install_handlers(start=2, count=1, handler_state=ExtHandlerState.NotInstalled)
+        self._install_handlers(start=3, count=1, handler_state=None)
+        os.makedirs(os.path.join(self.lib_dir, "sample_ext-1.3.4"))
+
+        eh = ExtHandler(name="sample_ext")
+        self.assertEqual("1.3.1", ExtHandlerInstance(eh, "unused").get_installed_version())
+
+        eh = ExtHandler(name="other_ext")
+        self.assertEqual(None, ExtHandlerInstance(eh, "unused").get_installed_version())
+
+
+    @patch("azurelinuxagent.common.conf.get_lib_dir")
+    def test_get_installed_version_caches_the_lib_dir_scan(self, mock_conf):
+        mock_conf.return_value = self.lib_dir
+
+        self._install_handlers(start=0, count=2, handler_state=ExtHandlerState.Enabled)
+        handler = ExtHandlerInstance(ExtHandler(name="sample_ext"), "unused")
+
+        with patch("azurelinuxagent.ga.exthandlers.scandir", wraps=scandir) as patch_scandir:
+            self.assertEqual("1.3.1", handler.get_installed_version())
+            self.assertEqual("1.3.1", handler.get_installed_version())
+            self.assertEqual(1, patch_scandir.call_count)
+
+            # changing the state of a handler invalidates the cached version
+            installed = ExtHandler(name="sample_ext")
+            installed.properties.version = "1.3.1"
+            ExtHandlerInstance(installed, "unused").set_handler_state(ExtHandlerState.NotInstalled)
+            self.assertEqual("1.3.0", handler.get_installed_version())
+            self.assertEqual(2, patch_scandir.call_count)
+
 
 class TestHandlerStateMigration(AgentTestCase):
     def setUp(self):
@@ -211,6 +263,20 @@ class TestHandlerStateMigration(AgentTestCase):
             os.path.isfile(os.path.join(self.ext_handler_i.get_conf_dir(), "HandlerStatus")))
         return
 
+    @patch("azurelinuxagent.ga.exthandlers.logger.warn")
+    def test_migration_migrates_partial_state(self, patch_warn):
+        self._prepare_handler_state()
+        self._prepare_handler_config()
+        os.remove(os.path.join(self.tmp_dir, "handler_state", self.ext_handler_i.get_full_name(), "status"))
+
+        migrate_handler_state()
+
+        self.assertEquals(self.ext_handler_i.get_handler_state(), self.handler_state)
+        self.assertFalse(
+            os.path.isfile(os.path.join(self.ext_handler_i.get_conf_dir(), "HandlerStatus")))
+        self.assertEqual(0, patch_warn.call_count)
+        return
+
     def test_migration_cleans_up(self):
         self._prepare_handler_state()
         self._prepare_handler_config()
@@ -258,11 +324,114 @@ class TestHandlerStateMigration(AgentTestCase):
         message = "A message"
 
         try:
-            with patch('json.dumps', return_value=None):
+            with patch('azurelinuxagent.ga.exthandlers._json_dumps', return_value=None):
                 self.ext_handler_i.set_handler_status(status=status, code=code, message=message)
         except Exception as e:
             self.fail("set_handler_status threw an exception")
 
+    def test_initialize_removes_the_bom_from_the_manifest(self):
+        self._prepare_handler_config()
+        base_dir = self.ext_handler_i.get_base_dir()
+        manifest = json.dumps([{"handlerManifest": {"enableCommand": "enable.sh"}}])
+        fileutil.write_file(os.path.join(base_dir, "HandlerManifest.json"), b'\xef\xbb\xbf' + manifest.encode('utf-8'), asbin=True)
+
+        self.ext_handler_i.initialize()
+
+        self.assertEqual(manifest, fileutil.read_file(self.ext_handler_i.get_manifest_file()))
+        self.assertEqual("enable.sh", self.ext_handler_i.load_manifest().get_enable_command())
+
+    def test_initialize_copies_the_manifest_to_the_base_dir(self):
+        self._prepare_handler_config()
+        base_dir = self.ext_handler_i.get_base_dir()
+        os.makedirs(os.path.join(base_dir, "bin"))
+        manifest = json.dumps([{"handlerManifest": {"enableCommand": "bin/enable.sh"}}])
+        fileutil.write_file(os.path.join(base_dir, "bin", "HandlerManifest.json"), manifest)
+
+        self.ext_handler_i.initialize()
+
+        self.assertEqual(manifest, fileutil.read_file(self.ext_handler_i.get_manifest_file()))
+
+    def test_update_settings_skips_unchanged_settings_files(self):
+        self._prepare_handler_config()
+        extension = Extension(name=self.ext_handler.name)
+        extension.sequenceNumber = 0
+        extension.publicSettings = {"foo": "bar"}
+        self.ext_handler.properties.extensions.append(extension)
+        settings_file = os.path.join(self.ext_handler_i.get_conf_dir(), "0.settings")
+
+        with patch("azurelinuxagent.ga.exthandlers.fileutil.write_file", wraps=fileutil.write_file) as patch_write_file:
+            self.ext_handler_i.update_settings()
+            ExtHandlerInstance(self.ext_handler, "dummy protocol").update_settings()
+            self.assertEqual(1, patch_write_file.call_count)
+
+            # the settings are written again if they change or if the file is removed
+            extension.publicSettings = {"foo": "baz"}
+            self.ext_handler_i.update_settings()
+            self.assertEqual(2, patch_write_file.call_count)
+            self.assertEqual({"foo": "baz"}, json.loads(fileutil.read_file(settings_file))["runtimeSettings"][0]["handlerSettings"]["publicSettings"])
+
+            os.remove(settings_file)
+            self.ext_handler_i.update_settings()
+            self.assertEqual(3, patch_write_file.call_count)
+            self.assertTrue(os.path.isfile(settings_file))
+
+    def test_update_settings_logs_only_the_settings_files_that_are_written(self):
+        self._prepare_handler_config()
+        extension = Extension(name=self.ext_handler.name)
+        extension.sequenceNumber = 0
+        extension.publicSettings = {"foo": "bar"}
+        self.ext_handler.properties.extensions.append(extension)
+
+        with patch.object(self.ext_handler_i.logger, "info") as patch_info:
+            self.ext_handler_i.update_settings()
+            patch_info.assert_called_once_with("Update settings file: {0}", "0.settings")
+
+            self.ext_handler_i.update_settings()
+            self.assertEqual(1, patch_info.call_count)
+
+    def test_load_manifest_shares_the_manifest_across_instances(self):
+        self._prepare_handler_config()
+        fileutil.write_file(self.ext_handler_i.get_manifest_file(),
+                            json.dumps([{"handlerManifest": {"enableCommand": "enable.sh"}}]))
+
+        manifest = self.ext_handler_i.load_manifest()
+        self.assertIs(manifest, ExtHandlerInstance(self.ext_handler, "dummy protocol").load_manifest())
+
+        self.ext_handler_i.invalidate_manifest()
+        self.assertIsNot(manifest, ExtHandlerInstance(self.ext_handler, "dummy protocol").load_manifest())
+
+    def test_load_manifest_reads_unchanged_manifest_once(self):
+        man_file = os.path.join(self.tmp_dir, "HandlerManifest.json")
+        fileutil.write_file(man_file, json.dumps([{"handlerManifest": {"enableCommand": "enable.sh"}}]))
+
+        with patch.object(self.ext_handler_i, "get_manifest_file", return_value=man_file):
+            with patch("azurelinuxagent.ga.exthandlers.fileutil.read_file", wraps=fileutil.read_file) as patch_read_file:
+                self.assertEqual("enable.sh", self.ext_handler_i.load_manifest().get_enable_command())
+                self.assertEqual("enable.sh", self.ext_handler_i.load_manifest().get_enable_command())
+                self.assertEqual(1, patch_read_file.call_count)
+
+                fileutil.write_file(man_file, json.dumps([{"handlerManifest": {"enableCommand": "enable2.sh"}}]))
+                self.assertEqual("enable2.sh", self.ext_handler_i.load_manifest().get_enable_command())
+                self.assertEqual(2, patch_read_file.call_count)
+
+    def test_instances_share_the_log_appender(self):
+        with patch("azurelinuxagent.ga.exthandlers.fileutil.mkdir") as patch_mkdir:
+            first = ExtHandlerInstance(self.ext_handler, "dummy protocol")
+            second = ExtHandlerInstance(self.ext_handler, "dummy protocol")
+
+        self.assertEqual(0, patch_mkdir.call_count)
+        self.assertIs(first.logger.appenders[0], second.logger.appenders[0])
+        self.assertIs(self.ext_handler_i.logger.appenders[0], first.logger.appenders[0])
+
+    def test_instances_recreate_a_removed_log_dir(self):
+        log_dir = self.ext_handler_i.get_log_dir()
+        shutil.rmtree(log_dir)
+
+        ext_handler_i = ExtHandlerInstance(self.ext_handler, "dummy protocol")
+
+        self.assertTrue(os.path.isdir(log_dir))
+        self.assertIs(self.ext_handler_i.logger.appenders[0], ext_handler_i.logger.appenders[0])
+
     @patch("shutil.move", side_effect=Exception)
     def test_migration_ignores_move_errors(self, shutil_mock):
         self._prepare_handler_state()
@@ -529,6 +698,18 @@ class TestExtension(ExtensionTestCase):
         self.assertEqual(exthandlers_handler.ext_handlers.extHandlers[0].properties.extensions[0].dependencyLevel, 6)
         self.assertEqual(exthandlers_handler.ext_handlers.extHandlers[1].properties.extensions[0].dependencyLevel, 5)
 
+    def test_ext_handler_sequencing_computes_sort_key_once(self, *args):
+        test_data = WireProtocolData(DATA_FILE_EXT_SEQUENCING)
+        exthandlers_handler, protocol = self._create_mock(test_data, *args)
+
+        sort_key = ExtHandler.sort_key
+        with patch.object(ExtHandler, "sort_key", autospec=True, side_effect=sort_key) as patch_sort_key:
+            exthandlers_handler.run()
+
+        self.assertEqual(2, patch_sort_key.call_count)
+        self.assertEqual(exthandlers_handler.ext_handlers.extHandlers[0].properties.extensions[0].dependencyLevel, 1)
+        self.assertEqual(exthandlers_handler.ext_handlers.extHandlers[1].properties.extensions[0].dependencyLevel, 2)
+
     def test_ext_handler_sequencing_default_dependency_level(self, *args):
         test_data = WireProtocolData(DATA_FILE)
         exthandlers_handler, protocol = self._create_mock(test_data, *args)
@@ -608,6 +789,121 @@ class TestExtension(ExtensionTestCase):
 
         self.assertEquals(expected_status_json, actual_status_json)
 
+    def test_ext_handler_does_not_rescan_the_lib_dir_for_installed_versions(self, *args):
+        test_data = WireProtocolData(DATA_FILE)
+        exthandlers_handler, protocol = self._create_mock(test_data, *args)
+        # the first run enables the handler, which changes its state and requires a new scan
+        exthandlers_handler.run()
+        exthandlers_handler.run()
+
+        # time.sleep is mocked in this class, so the time elapsed since the last run is simulated:
+        # the lib dir was modified and the status was reported MIN_STATUS_REPORT_INTERVAL ago, so
+        # the next run uploads the status again and rewrites the status file in the lib dir
+        lib_dir = conf.get_lib_dir()
+        lib_dir_mtime = time.time() - MIN_STATUS_REPORT_INTERVAL
+        os.utime(lib_dir, (lib_dir_mtime, lib_dir_mtime))
+        exthandlers_handler.last_report_time -= MIN_STATUS_REPORT_INTERVAL
+        later = time.gmtime(time.time() + MIN_STATUS_REPORT_INTERVAL)
+
+        with patch("azurelinuxagent.ga.exthandlers.scandir", wraps=scandir) as patch_scandir:
+            with patch('time.gmtime', MagicMock(return_value=later)):
+                exthandlers_handler.run()
+
+        self.assertNotEqual(lib_dir_mtime, os.stat(lib_dir).st_mtime)
+        # the only scan of the lib dir is the one done by cleanup_outdated_handlers
+        lib_dir_scans = [c for c in patch_scandir.call_args_list if c[0][0] == lib_dir]
+        self.assertEqual(1, len(lib_dir_scans))
+
+    def test_ext_handler_reporting_status_file_skips_unchanged_content(self, *args):
+        test_data = WireProtocolData(DATA_FILE)
+        exthandlers_handler, protocol = self._create_mock(test_data, *args)
+        exthandlers_handler.run()
+
+        status_path = os.path.join(conf.get_lib_dir(), AGENT_STATUS_FILE)
+        self.assertTrue(os.path.isfile(status_path))
+        self.assertFalse(os.path.exists(status_path + ".tmp"))
+
+        with patch("azurelinuxagent.ga.exthandlers.fileutil.write_file", wraps=fileutil.write_file) as patch_write_file:
+            # the content does not depend on the current time, only on the last upload
+            later = time.gmtime(time.time() + 3600)
+            with patch('time.gmtime', MagicMock(return_value=later)):
+                exthandlers_handler.report_ext_handlers_status()
+            self.assertEqual(1, protocol.report_vm_status.call_count)
+            self.assertEqual(0, patch_write_file.call_count)
+
+            # the file is rewritten if it has been removed
+            os.remove(status_path)
+            exthandlers_handler.report_ext_handlers_status()
+            self.assertEqual(1, patch_write_file.call_count)
+
+    def test_ext_handler_reporting_status_file_reports_the_last_confirmed_upload_time(self, *args):
+        test_data = WireProtocolData(DATA_FILE)
+        exthandlers_handler, protocol = self._create_mock(test_data, *args)
+        status_path = os.path.join(conf.get_lib_dir(), AGENT_STATUS_FILE)
+
+        def last_upload_time():
+            return json.loads(fileutil.read_file(status_path))["last_successful_status_upload_time"]
+
+        # no upload has been confirmed yet
+        protocol.report_vm_status.return_value = False
+        exthandlers_handler.run()
+        self.assertEqual(None, last_upload_time())
+
+        protocol.report_vm_status.return_value = True
+        with patch('time.gmtime', MagicMock(return_value=time.gmtime(0))):
+            exthandlers_handler.report_ext_handlers_status()
+        self.assertEqual("1970-01-01T00:00:00Z", last_upload_time())
+
+        # a skipped report does not change the time of the last upload
+        exthandlers_handler.report_ext_handlers_status()
+        self.assertEqual(2, protocol.report_vm_status.call_count)
+        self.assertEqual("1970-01-01T00:00:00Z", last_upload_time())
+
+    def test_ext_handler_reporting_skips_unchanged_status(self, *args):
+        test_data = WireProtocolData(DATA_FILE)
+        exthandlers_handler, protocol = self._create_mock(test_data, *args)
+        exthandlers_handler.run()
+        self.assertEqual(1, protocol.report_vm_status.call_count)
+
+        # same goal state and status, reported recently
+        exthandlers_handler.report_ext_handlers_status()
+        self.assertEqual(1, protocol.report_vm_status.call_count)
+
+        # the status is re-sent once MIN_STATUS_REPORT_INTERVAL has elapsed
+        exthandlers_handler.last_report_time -= MIN_STATUS_REPORT_INTERVAL
+        exthandlers_handler.report_ext_handlers_status()
+        self.assertEqual(2, protocol.report_vm_status.call_count)
+
+        # a new goal state is always reported
+        test_data.goal_state = test_data.goal_state.replace("<Incarnation>1<", "<Incarnation>2<")
+        exthandlers_handler.run()
+        self.assertEqual(3, protocol.report_vm_status.call_count)
+
+    def test_ext_handler_reporting_retries_deferred_upload(self, *args):
+        test_data = WireProtocolData(DATA_FILE)
+        exthandlers_handler, protocol = self._create_mock(test_data, *args)
+        protocol.report_vm_status.return_value = False
+        exthandlers_handler.run()
+        self.assertEqual(1, protocol.report_vm_status.call_count)
+
+        # the previous upload was not confirmed, so the same status is sent again
+        protocol.report_vm_status.return_value = True
+        exthandlers_handler.report_ext_handlers_status()
+        self.assertEqual(2, protocol.report_vm_status.call_count)
+
+        exthandlers_handler.report_ext_handlers_status()
+        self.assertEqual(2, protocol.report_vm_status.call_count)
+
+    def test_ext_handler_reporting_does_not_skip_if_clock_went_backwards(self, *args):
+        test_data = WireProtocolData(DATA_FILE)
+        exthandlers_handler, protocol = self._create_mock(test_data, *args)
+        exthandlers_handler.run()
+        self.assertEqual(1, protocol.report_vm_status.call_count)
+
+        exthandlers_handler.last_report_time += MIN_STATUS_REPORT_INTERVAL
+        exthandlers_handler.report_ext_handlers_status()
+        self.assertEqual(2, protocol.report_vm_status.call_count)
+
     def test_ext_handler_rollingupgrade(self, *args):
         test_data = WireProtocolData(DATA_FILE_EXT_ROLLINGUPGRADE)
         exthandlers_handler, protocol = self._create_mock(test_data, *args)
@@ -916,7 +1212,7 @@ class TestExtension(ExtensionTestCase):
         handler = ExtHandler(name="handler")
 
         ExtHandlerInstance.get_ext_handling_status = MagicMock(return_value=None)
-        self.assertTrue(exthandlers_handler.wait_for_handler_successful_completion(handler, datetime.datetime.utcnow()))
+        self.assertTrue(exthandlers_handler.wait_for_handler_successful_completion(handler, monotonic()))
 
     def _helper_wait_for_handler_successful_completion(self, exthandlers_handler):
         '''
@@ -930,7 +1226,7 @@ class TestExtension(ExtensionTestCase):
         exthandler.properties.extensions.append(extension)
 
         # Override the timeout value to minimize the test duration
-        wait_until = datetime.datetime.utcnow() + datetime.timedelta(seconds=5)
+        wait_until = monotonic() + 5
         return exthandlers_handler.wait_for_handler_successful_completion(exthandler, wait_until)
 
     def test_wait_for_handler_successful_completion_no_status(self, *args):
@@ -984,6 +1280,27 @@ class TestExtension(ExtensionTestCase):
         ExtHandlerInstance.get_ext_handling_status = MagicMock(return_value=status)
         self.assertFalse(self._helper_wait_for_handler_successful_completion(exthandlers_handler))
 
+    def test_wait_for_handler_successful_completion_backs_off(self, *args):
+        '''
+        Testing that wait_for_handler_successful_completion() polls with an exponentially increasing,
+        capped, interval until the extension reaches a terminal state.
+        '''
+        test_data = WireProtocolData(DATA_FILE)
+        exthandlers_handler, protocol = self._create_mock(test_data, *args)
+        mock_sleep = args[2]
+        mock_sleep.reset_mock()
+
+        exthandler = ExtHandler(name="Handler")
+        exthandler.properties.extensions.append(Extension(name="Handler"))
+
+        statuses = ["transitioning"] * 7 + ["success"]
+        ExtHandlerInstance.get_ext_handling_status = MagicMock(side_effect=statuses)
+        wait_until = monotonic() + 5 * 60
+        self.assertTrue(exthandlers_handler.wait_for_handler_successful_completion(exthandler, wait_until))
+
+        intervals = [call_args[0][0] for call_args in mock_sleep.call_args_list]
+        self.assertEqual([0.25, 0.5, 1, 2, 4, 5, 5], intervals)
+
     def test_get_ext_handling_status(self, *args):
         '''
         Testing get_ext_handling_status() function with various cases and
@@ -1010,14 +1327,16 @@ class TestExtension(ExtensionTestCase):
             [5, "filename", True, ExtensionStatus(status="success")]
         ]
 
-        orig_state = os.path.exists
         for case in test_cases:
             ext_handler_i = ExtHandlerInstance(exthandler, protocol)
-            ext_handler_i.get_status_file_path = MagicMock(return_value=(case[0], case[1]))
-            os.path.exists = MagicMock(return_value=case[2])
+            status_file = os.path.join(self.tmp_dir, case[1]) if case[1] is not None else None
+            ext_handler_i.get_status_file_path = MagicMock(return_value=(case[0], status_file))
             if case[2]:
+                fileutil.write_file(status_file, "")
                 # when the status file exists, it is expected return the value from collect_ext_status()
                 ext_handler_i.collect_ext_status = MagicMock(return_value=case[3])
+            elif status_file is not None and os.path.exists(status_file):
+                os.remove(status_file)
 
             status = ext_handler_i.get_ext_handling_status(extension)
             if case[2]:
@@ -1025,7 +1344,43 @@ class TestExtension(ExtensionTestCase):
             else:
                 self.assertEqual(status, case[3])
 
-        os.path.exists = orig_state
+    def test_get_ext_handling_status_reads_unchanged_status_file_once(self, *args):
+        test_data = WireProtocolData(DATA_FILE)
+        exthandlers_handler, protocol = self._create_mock(test_data, *args)
+
+        exthandler = ExtHandler(name="Handler")
+        extension = Extension(name="Handler")
+        exthandler.properties.extensions.append(extension)
+
+        status_file = os.path.join(self.tmp_dir, "0.status")
+        fileutil.write_file(status_file, json.dumps([{"status": {"status": "transitioning"}}]))
+
+        ext_handler_i = ExtHandlerInstance(exthandler, protocol)
+        ext_handler_i.get_status_file_path = MagicMock(return_value=(0, status_file))
+        with patch.object(ext_handler_i, "collect_ext_status", wraps=ext_handler_i.collect_ext_status) as patch_collect:
+            self.assertEqual("transitioning", ext_handler_i.get_ext_handling_status(extension))
+            self.assertEqual("transitioning", ext_handler_i.get_ext_handling_status(extension))
+            self.assertEqual(1, patch_collect.call_count)
+
+            fileutil.write_file(status_file, json.dumps([{"status": {"status": "success"}}]))
+            self.assertEqual("success", ext_handler_i.get_ext_handling_status(extension))
+            self.assertEqual(2, patch_collect.call_count)
+
+    def test_get_ext_handling_status_looks_up_the_status_file_once(self, *args):
+        test_data = WireProtocolData(DATA_FILE)
+        exthandlers_handler, protocol = self._create_mock(test_data, *args)
+
+        exthandler = ExtHandler(name="Handler")
+        extension = Extension(name="Handler")
+        exthandler.properties.extensions.append(extension)
+
+        status_file = os.path.join(self.tmp_dir, "0.status")
+        fileutil.write_file(status_file, json.dumps([{"status": {"status": "success"}}]))
+
+        ext_handler_i = ExtHandlerInstance(exthandler, protocol)
+        ext_handler_i.get_status_file_path = MagicMock(return_value=(0, status_file))
+        self.assertEqual("success", ext_handler_i.get_ext_handling_status(extension))
+        self.assertEqual(1, ext_handler_i.get_status_file_path.call_count)
 
     def test_is_ext_handling_complete(self, *args):
         '''
@@ -1223,9 +1578,10 @@ class TestExtension(ExtensionTestCase):
         self.assertEqual(1, protocol.report_vm_status.call_count)
         self._assert_handler_status(protocol.report_vm_status, "NotReady", expected_ext_count=1, version="1.0.0")
 
+        # The status did not change, so it is not reported again
         exthandlers_handler.run()
         self.assertEqual(1, patch_get_enable_command.call_count)
-        self.assertEqual(2, protocol.report_vm_status.call_count)
+        self.assertEqual(1, protocol.report_vm_status.call_count)
 
     @patch('azurelinuxagent.ga.exthandlers.ExtHandlersHandler.handle_ext_handler_error')
     @patch('azurelinuxagent.ga.exthandlers.HandlerManifest.get_enable_command')
@@ -1274,10 +1630,10 @@ class TestExtension(ExtensionTestCase):
         self.assertEqual(2, protocol.report_vm_status.call_count)
         self._assert_handler_status(protocol.report_vm_status, "NotReady", expected_ext_count=1, version="1.0.0")
 
-        # Ensure there are no further retries
+        # Ensure there are no further retries (the unchanged status is not reported again)
         exthandlers_handler.run()
         self.assertEqual(1, patch_get_disable_command.call_count)
-        self.assertEqual(3, protocol.report_vm_status.call_count)
+        self.assertEqual(2, protocol.report_vm_status.call_count)
         self._assert_handler_status(protocol.report_vm_status, "NotReady", expected_ext_count=1, version="1.0.0")
 
     @patch('azurelinuxagent.ga.exthandlers.ExtHandlersHandler.handle_ext_handler_error')
@@ -1339,10 +1695,10 @@ class TestExtension(ExtensionTestCase):
         self.assertEquals("Ready", protocol.report_vm_status.call_args[0][0].vmAgent.status)
         self._assert_no_handler_status(protocol.report_vm_status)
 
-        # Ensure there are no further retries
+        # Ensure there are no further retries (the unchanged status is not reported again)
         exthandlers_handler.run()
         self.assertEqual(1, patch_get_uninstall_command.call_count)
-        self.assertEqual(3, protocol.report_vm_status.call_count)
+        self.assertEqual(2, protocol.report_vm_status.call_count)
         self.assertEquals("Ready", protocol.report_vm_status.call_args[0][0].vmAgent.status)
         self._assert_no_handler_status(protocol.report_vm_status)
 
@@ -1650,9 +2006,7 @@ class TestExtensionSequencing(AgentTestCase):
         conf.get_enable_overprovisioning = Mock(return_value=False)
 
         def wait_for_handler_successful_completion(prev_handler, wait_until):
-            return orig_wait_for_handler_successful_completion(prev_handler,
-                                                               datetime.datetime.utcnow() + datetime.timedelta(
-                                                                   seconds=5))
+            return orig_wait_for_handler_successful_completion(prev_handler, monotonic() + 5)
 
         orig_wait_for_handler_successful_completion = handler.wait_for_handler_successful_completion
         handler.wait_for_handler_successful_completion = wait_for_handler_successful_completion
@@ -3,7 +3,8 @@
 import json
 
 from azurelinuxagent.common.protocol.restapi import ExtensionStatus, Extension, ExtHandler, ExtHandlerProperties
-from azurelinuxagent.ga.exthandlers import parse_ext_status, ExtHandlerInstance, get_exthandlers_handler
+from azurelinuxagent.ga.exthandlers import parse_ext_status, ExtHandlerInstance, get_exthandlers_handler, \
+    HandlerManifest, _json_dumps, _json_loads, _format_traceback, TRACEBACK_LIMIT
 from azurelinuxagent.common.exception import ProtocolError, ExtensionError, ExtensionErrorCodes
 from azurelinuxagent.common.event import WALAEventOperation
 from azurelinuxagent.common.utils.extensionprocessutil import TELEMETRY_MESSAGE_MAX_LEN, format_stdout_stderr, read_output
@@ -127,6 +128,72 @@ class TestExtHandlers(AgentTestCase):
         self.assertTrue(isinstance(extension_status.substatusList, list), 'substatus was not parsed correctly')
         self.assertEqual(0, len(extension_status.substatusList))
 
+    def test_parse_ext_status_should_parse_substatus(self):
+        status = '''[{
+            "status": {
+              "status": "success",
+              "operation": "Enable",
+              "code": "0",
+              "substatus": [
+                {
+                  "name": "StdOut",
+                  "status": "success",
+                  "code": 1,
+                  "formattedMessage": {
+                    "lang": "en-US",
+                    "message": "Hello"
+                  }
+                },
+                {
+                  "name": "StdErr",
+                  "status": "warning"
+                }
+              ]
+            }
+          }
+        ]'''
+
+        extension_status = ExtensionStatus(seq_no=0)
+
+        parse_ext_status(extension_status, json.loads(status))
+
+        self.assertEqual(2, len(extension_status.substatusList))
+        substatus = extension_status.substatusList[0]
+        self.assertEqual(("StdOut", "success", 1, "Hello"),
+                         (substatus.name, substatus.status, substatus.code, substatus.message))
+        substatus = extension_status.substatusList[1]
+        self.assertEqual(("StdErr", "warning", 0, None),
+                         (substatus.name, substatus.status, substatus.code, substatus.message))
+
+    def test_parse_ext_status_should_parse_malformed_status_as_error(self):
+        for value in ('["success"]', '{"status": "success"}'):
+            extension_status = ExtensionStatus(seq_no=0)
+
+            parse_ext_status(extension_status, json.loads('[{"status": {"status": ' + value + '}}]'))
+
+            self.assertEqual('error', extension_status.status)
+
+    def test_parse_ext_status_should_ignore_empty_status(self):
+        for status in (None, []):
+            extension_status = ExtensionStatus(seq_no=0)
+
+            parse_ext_status(extension_status, status)
+
+            self.assertEqual(None, extension_status.status)
+
+    def test_parse_ext_status_should_reject_missing_status(self):
+        for status in ('[{}]', '[{"status": {}}]', '[{"status": "success"}]'):
+            self.assertRaises(ExtensionError, parse_ext_status, ExtensionStatus(seq_no=0), json.loads(status))
+
+    def test_parse_ext_status_should_reject_invalid_substatus(self):
+        for substatus in ('{"name": "StdOut"}', '{"name": "StdOut", "status": "failed"}',
+                          '{"name": "StdOut", "status": ["success"]}', '"x"', '["x"]', '1'):
+            status = '[{"status": {"status": "success", "substatus": [' + substatus + ']}}]'
+            self.assertRaises(ExtensionError, parse_ext_status, ExtensionStatus(seq_no=0), json.loads(status))
+
+        status = '[{"status": {"status": "success", "substatus": "x"}}]'
+        self.assertRaises(ExtensionError, parse_ext_status, ExtensionStatus(seq_no=0), json.loads(status))
+
     @patch('azurelinuxagent.common.event.EventLogger.add_event')
     @patch('azurelinuxagent.ga.exthandlers.ExtHandlerInstance.get_largest_seq_no')
     def assert_extension_sequence_number(self,
@@ -187,6 +254,103 @@ class TestExtHandlers(AgentTestCase):
                                               disk_sequence_number=3,
                                               expected_sequence_number=-1)
 
+    def test_get_largest_seq_no_should_ignore_files_that_are_not_settings(self):
+        ext_handler_props = ExtHandlerProperties()
+        ext_handler_props.version = "1.2.3"
+        ext_handler = ExtHandler(name='foo')
+        ext_handler.properties = ext_handler_props
+        instance = ExtHandlerInstance(ext_handler=ext_handler, protocol=None)
+
+        conf_dir = os.path.join(self.tmp_dir, "conf")
+        os.makedirs(os.path.join(conf_dir, "9.settings"))
+        for name in ("0.settings", "4.settings", "7.status", "HandlerState", "x.settings", ".settings"):
+            fileutil.write_file(os.path.join(conf_dir, name), "")
+
+        with patch.object(instance, "get_conf_dir", return_value=conf_dir):
+            self.assertEqual(4, instance.get_largest_seq_no())
+
+    def test_paths_should_follow_the_handler_version(self):
+        ext_handler_props = ExtHandlerProperties()
+        ext_handler_props.version = "1.2.3"
+        ext_handler = ExtHandler(name='foo')
+        ext_handler.properties = ext_handler_props
+        instance = ExtHandlerInstance(ext_handler=ext_handler, protocol=None)
+
+        base_dir = os.path.join(conf.get_lib_dir(), "foo-1.2.3")
+        self.assertEqual("foo-1.2.3", instance.get_full_name())
+        self.assertEqual(base_dir, instance.get_base_dir())
+        self.assertEqual(os.path.join(base_dir, "config"), instance.get_conf_dir())
+        self.assertIs(instance.get_conf_dir(), instance.get_conf_dir())
+
+        ext_handler_props.version = "1.2.4"
+        base_dir = os.path.join(conf.get_lib_dir(), "foo-1.2.4")
+        self.assertEqual("foo-1.2.4", instance.get_full_name())
+        self.assertEqual(base_dir, instance.get_base_dir())
+        self.assertEqual(os.path.join(base_dir, "config"), instance.get_conf_dir())
+        self.assertEqual(os.path.join(base_dir, "status"), instance.get_status_dir())
+
+    def test_handler_manifest_should_parse_the_flags(self):
+        manifest = HandlerManifest({"handlerManifest": {
+            "reportHeartbeat": True,
+            "updateMode": "UpdateWithoutInstall",
+            "continueOnUpdateFailure": True,
+        }})
+        self.assertTrue(manifest.is_report_heartbeat())
+        self.assertFalse(manifest.is_update_with_install())
+        self.assertTrue(manifest.is_continue_on_update_failure())
+
+    def test_handler_manifest_should_parse_the_name_and_version(self):
+        manifest = HandlerManifest({"name": "Foo.Bar", "version": "1.0", "handlerManifest": {}})
+        self.assertEqual("Foo.Bar", manifest.get_name())
+        self.assertEqual("1.0", manifest.get_version())
+
+    def test_handler_manifest_should_ignore_the_case_of_the_update_mode(self):
+        for update_mode, expected in (("UpdateWithInstall", True), ("updatewithinstall", True), ("UPDATEWITHINSTALL", True),
+                                      ("UpdateWithoutInstall", False), ("updatewithoutinstall", False)):
+            manifest = HandlerManifest({"handlerManifest": {"updateMode": update_mode}})
+            self.assertEqual(expected, manifest.is_update_with_install(), update_mode)
+
+    def test_handler_manifest_should_not_fail_on_a_malformed_update_mode(self):
+        for update_mode in (True, 1, ["UpdateWithInstall"], {}):
+            manifest = HandlerManifest({"handlerManifest": {"updateMode": update_mode, "enableCommand": "enable.sh"}})
+            self.assertFalse(manifest.is_update_with_install(), update_mode)
+            self.assertEqual("enable.sh", manifest.get_enable_command())
+
+    def test_handler_manifest_should_convert_the_flags_to_bool(self):
+        manifest = HandlerManifest({"handlerManifest": {"reportHeartbeat": 1, "continueOnUpdateFailure": None}})
+        self.assertIs(True, manifest.is_report_heartbeat())
+        self.assertIs(False, manifest.is_continue_on_update_failure())
+
+    def test_handler_manifest_should_default_the_flags(self):
+        manifest = HandlerManifest({"handlerManifest": {"enableCommand": "enable.sh"}})
+        self.assertFalse(manifest.is_report_heartbeat())
+        self.assertTrue(manifest.is_update_with_install())
+        self.assertFalse(manifest.is_continue_on_update_failure())
+        self.assertEqual("enable.sh", manifest.get_enable_command())
+        self.assertRaises(KeyError, manifest.get_install_command)
+
+    def test_copy_status_files_should_copy_the_status_files_and_mrseq(self):
+        def create_instance(version):
+            ext_handler_props = ExtHandlerProperties()
+            ext_handler_props.version = version
+            ext_handler = ExtHandler(name='foo')
+            ext_handler.properties = ext_handler_props
+            instance = ExtHandlerInstance(ext_handler=ext_handler, protocol=None)
+            os.makedirs(os.path.join(instance.get_status_dir(), "0.status.d"))
+            return instance
+
+        old_instance = create_instance("1.0.0")
+        new_instance = create_instance("1.0.1")
+        fileutil.write_file(os.path.join(old_instance.get_base_dir(), "mrseq"), "1")
+        fileutil.write_file(os.path.join(old_instance.get_status_dir(), "0.status"), "[]")
+        fileutil.write_file(os.path.join(old_instance.get_status_dir(), "1.status"), "[]")
+
+        new_instance.copy_status_files(old_instance)
+
+        self.assertEqual("1", fileutil.read_file(os.path.join(new_instance.get_base_dir(), "mrseq")))
+        self.assertEqual(["0.status", "0.status.d", "1.status"], sorted(os.listdir(new_instance.get_status_dir())))
+        self.assertEqual([], os.listdir(os.path.join(new_instance.get_status_dir(), "0.status.d")))
+
     @patch("azurelinuxagent.ga.exthandlers.add_event")
     @patch("azurelinuxagent.common.errorstate.ErrorState.is_triggered")
     @patch("azurelinuxagent.common.protocol.util.ProtocolUtil.get_protocol")
@@ -210,6 +374,55 @@ class TestExtHandlers(AgentTestCase):
         self.assertIn(test_message, second_call_args['message'])
 
 
+    def test_format_traceback_should_keep_the_innermost_frames(self):
+        def raise_error():
+            raise ValueError("innermost error")
+
+        def call_nested(depth):
+            if depth == 0:
+                raise_error()
+            call_nested(depth - 1)
+
+        try:
+            call_nested(2 * TRACEBACK_LIMIT)
+        except ValueError:
+            formatted = _format_traceback()
+
+        self.assertIn("in raise_error", formatted)
+        self.assertNotIn("in test_format_traceback_should_keep_the_innermost_frames", formatted)
+        self.assertTrue(formatted.endswith("ValueError: innermost error\n"))
+
+    def test_json_loads_should_accept_the_input_accepted_by_the_json_module(self):
+        def fast_json_loads(_):
+            raise ValueError("unsupported input")
+
+        data = '{"nan": NaN, "infinity": Infinity, "big": 123456789012345678901234567890}'
+
+        for fast_loads in (fast_json_loads, None):
+            with patch("azurelinuxagent.ga.exthandlers._fast_json_loads", fast_loads):
+                value = _json_loads(data)
+                self.assertTrue(value["nan"] != value["nan"])
+                self.assertEqual(float("inf"), value["infinity"])
+                self.assertEqual(123456789012345678901234567890, value["big"])
+
+                self.assertRaises(ValueError, _json_loads, '{"invalid": ')
+
+        # whichever codec is installed
+        self.assertEqual(123456789012345678901234567890, _json_loads(data)["big"])
+
+    def test_json_dumps_should_fall_back_to_the_json_module(self):
+        def fast_json_dumps(_):
+            raise OverflowError("unsupported input")
+
+        for fast_dumps in (fast_json_dumps, None):
+            with patch("azurelinuxagent.ga.exthandlers._fast_json_dumps", fast_dumps):
+                self.assertEqual('{"big":123456789012345678901234567890}',
+                                 _json_dumps({"big": 123456789012345678901234567890}))
+
+        self.assertEqual({"big": 123456789012345678901234567890},
+                         json.loads(_json_dumps({"big": 123456789012345678901234567890})))
+
+
 class LaunchCommandTestCase(AgentTestCase):
     """
     Test cases for launch_command
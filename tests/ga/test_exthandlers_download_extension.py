@@ -196,12 +196,13 @@ class DownloadExtensionTestCase(AgentTestCase):
             DownloadExtensionTestCase._create_invalid_zip_file(self._get_extension_package_file())
             return True
 
-        with patch("time.sleep", lambda *_: None):
+        with patch("time.sleep") as mock_sleep:
             with patch("azurelinuxagent.common.protocol.wire.WireProtocol.download_ext_handler_pkg", side_effect=download_ext_handler_pkg) as mock_download_ext_handler_pkg:
                 with self.assertRaises(ExtensionDownloadError) as context_manager:
                     self.ext_handler_instance.download()
 
         self.assertEquals(mock_download_ext_handler_pkg.call_count, NUMBER_OF_DOWNLOAD_RETRIES * len(self.pkg.uris))
+        self.assertEquals(mock_sleep.call_count, NUMBER_OF_DOWNLOAD_RETRIES - 1, "Should not wait after the last round of downloads")
 
         self.assertRegex(str(context_manager.exception), "Failed to download extension")
         self.assertEquals(context_manager.exception.code, ExtensionErrorCodes.PluginManifestDownloadError)
@@ -301,7 +301,10 @@ class TestHostPlugin(AgentTestCase):
         wire_protocol_client.status_blob.set_vm_status(status)
 
         # act
-        wire_protocol_client.upload_status_blob()
+        uploaded = wire_protocol_client.upload_status_blob()
+
+        # assert the upload is reported as deferred
+        self.assertFalse(uploaded, "Upload was reported as completed")
 
         # assert direct route is not called
         self.assertEqual(0, patch_upload.call_count, "Direct channel was used")
@@ -247,7 +247,7 @@ class TestWireProtocol(AgentTestCase):
             with patch.object(HostPluginProtocol, "put_vm_status") as patch_host_ga_plugin_upload:
                 with patch.object(StatusBlob, "upload") as patch_default_upload:
                     HostPluginProtocol.set_default_channel(False)
-                    wire_protocol_client.upload_status_blob()
+                    self.assertTrue(wire_protocol_client.upload_status_blob())
 
                     # do not call the direct method unless host plugin fails
                     patch_default_upload.assert_not_called()
@@ -18,6 +18,7 @@
 import errno as errno
 import glob
 import random
+import stat
 import string
 import tempfile
 import uuid
@@ -193,6 +194,23 @@ Third line with more words
 
         self.assertEqual(set(expected_files), set(actual_files))
 
+    def test_add_mode_to_tree(self):
+        test_subdir = os.path.join(self.tmp_dir, 'test_dir')
+        os.mkdir(test_subdir)
+        plain_file = os.path.join(self.tmp_dir, 'plain_file')
+        executable_file = os.path.join(test_subdir, 'executable_file')
+        for file in (plain_file, executable_file):
+            open(file, 'a').close()
+        os.chmod(plain_file, 0o644)
+        os.chmod(executable_file, 0o755)
+
+        with patch('os.chmod', wraps=os.chmod) as patch_chmod:
+            fileutil.add_mode_to_tree(self.tmp_dir, stat.S_IXUSR)
+
+        self.assertEqual(0o744, stat.S_IMODE(os.stat(plain_file).st_mode))
+        self.assertEqual(0o755, stat.S_IMODE(os.stat(executable_file).st_mode))
+        self.assertEqual([call(plain_file, os.stat(plain_file).st_mode)], patch_chmod.call_args_list)
+
     @patch('os.path.isfile')
     def test_update_conf_file(self, _):
         new_file = "\
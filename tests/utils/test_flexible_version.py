@@ -526,6 +526,23 @@ class TestFlexibleVersion(unittest.TestCase):
         self.assertTrue(FlexibleVersion("1.1") != FlexibleVersion("1.0"))
         return
 
+    def test_order_ignores_trailing_zeros(self):
+        self.assertEqual(FlexibleVersion("1.0.2.0"), FlexibleVersion("1.0.2"))
+        self.assertTrue(FlexibleVersion("1.0.2") < FlexibleVersion("1.0.2.0.1"))
+        self.assertTrue(FlexibleVersion("1.1") > FlexibleVersion("1.0.9.9"))
+        self.assertTrue(FlexibleVersion("1.0.0rc1") < FlexibleVersion("1"))
+        self.assertEqual(FlexibleVersion("1.0.0rc1"), FlexibleVersion("1rc1"))
+        return
+
+    def test_patterns_are_shared(self):
+        v1 = FlexibleVersion('1.2.3')
+        v2 = FlexibleVersion('1-2-3', sep='-')
+        v3 = FlexibleVersion('1.2.4')
+        self.assertIs(v1.version_re, v3.version_re)
+        self.assertIsNot(v1.version_re, v2.version_re)
+        self.assertEqual((1, 2, 3), v2.version)
+        return
+
 
 if __name__ == '__main__':
     unittest.main()